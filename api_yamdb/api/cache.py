@@ -0,0 +1,179 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from core import metrics
+from core.caches import is_shared as caches_are_shared
+from core.db import primary_if_changed
+
+CACHE_ALIAS = getattr(settings, 'CATALOG_CACHE_ALIAS', 'catalog')
+
+
+class CacheStats:
+    """Счётчики попаданий и промахов кэша каталога в текущем процессе."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self.lock:
+            self.hits += 1
+        metrics.CACHE_LOOKUPS.labels('hit').inc()
+
+    def miss(self):
+        with self.lock:
+            self.misses += 1
+        metrics.CACHE_LOOKUPS.labels('miss').inc()
+
+    def as_dict(self):
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else None,
+        }
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def is_shared():
+    """Общий ли кэш каталога для всех процессов. В locmem версии живут в
+    памяти одного воркера, и изменение в другом воркере их не сдвигает.
+    """
+    return caches_are_shared(get_cache())
+
+
+def version_key(resource, pk=None):
+    if pk is None:
+        return f'catalog:version:{resource}'
+    return f'catalog:version:{resource}:{pk}'
+
+
+def get_versions(keys):
+    """Возвращает версии ключей.
+
+    Версия — время последнего изменения ресурса в наносекундах, поэтому
+    по ней же строится Last-Modified. Отсутствующие (в том числе
+    вытесненные) версии инициализируются текущим временем, чтобы не
+    совпасть со старыми.
+    """
+    cache = get_cache()
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    for key in missing:
+        cache.add(key, time.time_ns(), None)
+    if missing:
+        versions.update(cache.get_many(missing))
+    return [versions.get(key) for key in keys]
+
+
+def bump(resource, pk=None):
+    """Инвалидирует кэш ресурса (или одного объекта ресурса)."""
+    cache = get_cache()
+    key = version_key(resource, pk)
+    current = cache.get(key) or 0
+    cache.set(key, max(time.time_ns(), current + 1), None)
+
+
+def resolve_slugs(model, resource, slugs):
+    """Переводит слаги в первичные ключи ``model``.
+
+    Соответствие кэшируется под версией ресурса, поэтому переименование
+    или удаление объекта сразу его инвалидирует. Неизвестные слаги тоже
+    кэшируются (как 0) и в результат не попадают.
+    """
+    cache = get_cache()
+    version, = get_versions([version_key(resource)])
+    keys = {
+        slug: f'catalog:slug:{resource}:{version}:{slug}' for slug in slugs
+    }
+    cached = cache.get_many(keys.values())
+    ids = {slug: cached[key] for slug, key in keys.items() if key in cached}
+    missing = [slug for slug in slugs if slug not in ids]
+    if missing:
+        found = dict(
+            model.objects.filter(slug__in=missing).values_list('slug', 'pk')
+        )
+        fetched = {slug: found.get(slug, 0) for slug in missing}
+        cache.set_many({keys[slug]: pk for slug, pk in fetched.items()})
+        ids.update(fetched)
+    return {slug: pk for slug, pk in ids.items() if pk}
+
+
+def normalize_query(query_params):
+    return urlencode(sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        for value in values
+        if value != ''
+    ))
+
+
+class CatalogCacheMixin:
+    """Кэширует ответы list и retrieve вьюсета.
+
+    Ключ строится из пути, нормализованного query string и версий
+    ресурса; версии сдвигаются сигналами из ``api.signals``. Для ресурсов
+    с ``cache_per_object = True`` detail-ответ дополнительно зависит от
+    версии конкретного объекта, а list — от общей версии списка.
+    """
+
+    cache_resource = None
+    cache_per_object = False
+
+    def version_keys(self):
+        keys = [version_key(self.cache_resource)]
+        if self.cache_per_object:
+            if self.action == 'list':
+                keys.append(version_key(self.cache_resource, 'list'))
+            else:
+                lookup_kwarg = self.lookup_url_kwarg or self.lookup_field
+                keys.append(
+                    version_key(self.cache_resource, self.kwargs[lookup_kwarg])
+                )
+        return keys
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, view, request, *args, **kwargs):
+        cache = get_cache()
+        versions = get_versions(self.version_keys())
+        digest = hashlib.md5(
+            f'{request.path}?{normalize_query(request.query_params)}'.encode()
+        ).hexdigest()
+        key = 'catalog:response:{}:{}:{}'.format(
+            self.cache_resource, ':'.join(map(str, versions)), digest
+        )
+        data = cache.get(key)
+        if data is not None:
+            stats.hit()
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        stats.miss()
+        with primary_if_changed(versions):
+            response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
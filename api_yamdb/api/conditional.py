@@ -0,0 +1,136 @@
+import hashlib
+from contextlib import nullcontext
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from api.cache import get_versions, is_shared, normalize_query
+from core.db import primary_if_changed
+
+
+class ConditionalGetMixin:
+    """Поддержка условных GET запросов (ETag / Last-Modified) для list
+    и retrieve.
+
+    Если задано ``conditional_date_field`` (время последнего изменения
+    объекта), валидаторы строятся по состоянию БД: количество объектов,
+    максимальные время изменения и id в том же отфильтрованном queryset,
+    что и ответ, — одним агрегирующим запросом. Удаление объекта не
+    сдвигает максимальное время изменения, поэтому списки отдают только
+    ETag, без Last-Modified. Иначе валидаторы строятся из версий ресурса,
+    которые возвращает ``version_keys()`` вьюсета (см. ``api.cache``);
+    версии видны всем воркерам, только если кэш каталога общий, поэтому
+    с locmem условные запросы для таких вьюсетов отключены. При
+    совпадении ``If-None-Match`` или ``If-Modified-Since`` отдаётся 304
+    без сериализации.
+
+    При пагинации по ключу агрегат по всему queryset не строится:
+    валидаторы считаются по объектам текущей страницы, а сама страница
+    переиспользуется при формировании ответа.
+    """
+
+    conditional_date_field = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = None
+        if self.conditional_date_field and not self.keyset_paginated():
+            queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            queryset, super().list, request, *args, **kwargs
+        )
+
+    def keyset_paginated(self):
+        uses_keyset = getattr(self.paginator, 'uses_keyset', None)
+        return bool(
+            self.conditional_date_field
+            and uses_keyset
+            and uses_keyset(self.request)
+        )
+
+    def paginate_queryset(self, queryset):
+        if hasattr(self, 'conditional_page'):
+            return self.conditional_page
+        return super().paginate_queryset(queryset)
+
+    def page_summary(self):
+        """Сводка по странице пагинации по ключу: id и время изменения
+        объектов и наличие соседних страниц.
+        """
+        self.conditional_page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        paginator = self.paginator.active
+        changed = [
+            getattr(obj, self.conditional_date_field)
+            for obj in self.conditional_page
+        ]
+        return {
+            'page': [obj.pk for obj in self.conditional_page],
+            'changed': changed,
+            'next': paginator.has_next,
+            'previous': paginator.has_previous,
+            'latest': max(changed, default=None),
+        }
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = None
+        if self.conditional_date_field:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_kwarg]}
+            )
+        return self.conditional_response(
+            queryset, super().retrieve, request, *args, **kwargs
+        )
+
+    def get_validators(self, queryset, versions):
+        parts = [
+            self.request.path,
+            normalize_query(self.request.query_params),
+            self.request.accepted_media_type,
+        ]
+        if self.conditional_date_field:
+            if queryset is None:
+                summary = self.page_summary()
+            else:
+                summary = queryset.order_by().aggregate(
+                    count=Count('pk'),
+                    latest=Max(self.conditional_date_field),
+                    last_id=Max('pk'),
+                )
+            parts.extend(summary.values())
+            latest = summary['latest']
+            if self.action == 'list':
+                last_modified = None
+            else:
+                last_modified = int(latest.timestamp()) if latest else 0
+        else:
+            parts.extend(versions)
+            last_modified = max(versions) // 10 ** 9
+        digest = hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+        return f'"{digest}"', last_modified
+
+    def conditional_response(self, queryset, view, request, *args, **kwargs):
+        if self.conditional_date_field:
+            # Валидаторы и ответ читаются из одной БД, поэтому с репликой
+            # они согласованы и без версий.
+            versions, reading = None, nullcontext()
+        elif is_shared():
+            versions = get_versions(self.version_keys())
+            reading = primary_if_changed(versions)
+        else:
+            return view(request, *args, **kwargs)
+        with reading:
+            etag, last_modified = self.get_validators(queryset, versions)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
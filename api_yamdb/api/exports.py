@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+
+from categories.models import Title, TitleGenre
+from reviews.models import Comment, Review
+
+
+class Export:
+    """Выгрузка модели: столбцы и поля ``values_list``, из которых они
+    берутся. Связанные поля (автор, произведение) попадают в тот же
+    запрос через JOIN.
+    """
+
+    extra_columns = ()
+
+    def __init__(self, model, columns, filters=None):
+        self.model = model
+        self.columns = columns
+        # Допустимые фильтры из query string: параметр -> поле.
+        self.filters = filters or {}
+
+    @property
+    def field_names(self):
+        return (*self.columns, *self.extra_columns)
+
+    def get_queryset(self, params):
+        queryset = self.model.objects.order_by('pk')
+        errors = {}
+        for param, field in self.filters.items():
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                value = self.model_field(field).to_python(value)
+            except ValidationError as error:
+                errors[param] = error.messages
+                continue
+            queryset = queryset.filter(**{field: value})
+        if errors:
+            raise serializers.ValidationError(errors)
+        return queryset.values_list(*self.columns.values())
+
+    def model_field(self, path):
+        """Поле модели по пути фильтра, в том числе через связи
+        (``review__title_id``).
+        """
+        model = self.model
+        *relations, name = path.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def chunks(self, queryset, size):
+        """Строки пачками по ``size``: серверный курсор (``iterator``)
+        держит в памяти одну пачку, а не всю выборку.
+        """
+        rows = queryset.iterator(chunk_size=size)
+        while True:
+            chunk = [
+                dict(zip(self.columns, row)) for row in islice(rows, size)
+            ]
+            if not chunk:
+                return
+            yield chunk
+
+
+class TitleExport(Export):
+    extra_columns = ('genres',)
+
+    def chunks(self, queryset, size):
+        # Жанры добираются одним запросом на пачку произведений.
+        for chunk in super().chunks(queryset, size):
+            genres = {}
+            pairs = TitleGenre.objects.filter(
+                title_id__in=[row['id'] for row in chunk]
+            ).order_by('genre__slug').values_list('title_id', 'genre__slug')
+            for title_id, slug in pairs.using(queryset.db):
+                genres.setdefault(title_id, []).append(slug)
+            for row in chunk:
+                row['genres'] = genres.get(row['id'], [])
+            yield chunk
+
+
+EXPORTS = {
+    'reviews': Export(
+        Review,
+        {
+            'id': 'id',
+            'title_id': 'title_id',
+            'author': 'author__username',
+            'text': 'text',
+            'score': 'score',
+            'pub_date': 'pub_date',
+        },
+        filters={'title_id': 'title_id'},
+    ),
+    'comments': Export(
+        Comment,
+        {
+            'id': 'id',
+            'review_id': 'review_id',
+            'title_id': 'review__title_id',
+            'author': 'author__username',
+            'text': 'text',
+            'pub_date': 'pub_date',
+        },
+        filters={'title_id': 'review__title_id', 'review_id': 'review_id'},
+    ),
+    'titles': TitleExport(
+        Title,
+        {
+            'id': 'id',
+            'name': 'name',
+            'year': 'year',
+            'description': 'description',
+            'category': 'category__slug',
+            'rating': 'rating',
+            'rating_count': 'rating_count',
+            'weighted_rating': 'weighted_rating',
+        },
+        filters={'category': 'category__slug', 'year': 'year'},
+    ),
+}
+
+
+def ndjson_lines(export, chunks):
+    for chunk in chunks:
+        yield ''.join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+            for row in chunk
+        )
+
+
+def csv_lines(export, chunks):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, export.field_names)
+    writer.writeheader()
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            {
+                column: ','.join(value) if isinstance(value, list) else value
+                for column, value in row.items()
+            }
+            for row in chunk
+        )
+        yield buffer.getvalue()
+
+
+FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines),
+    'csv': ('text/csv; charset=utf-8', csv_lines),
+}
@@ -0,0 +1,65 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
+from rest_framework import permissions
+
+
+class SparseFieldsetMixin:
+    """Сокращённые ответы: ``?fields=id,name`` оставляет только
+    перечисленные поля, ``?exclude=description`` убирает поля.
+
+    Поля сериализатора отбирает ``SparseFieldsMixin``, а queryset
+    сокращается вместе с ними: ``get_queryset`` вьюсета проверяет
+    ``wants()`` перед ``select_related``/``prefetch_related``, а
+    ``filter_queryset`` загружает через ``only()`` только столбцы
+    оставшихся полей и ``sparse_model_fields``.
+    """
+
+    # Поля модели, которые нужны всегда, даже если их нет в ответе
+    # (например, ключ курсора пагинации).
+    sparse_model_fields = ()
+
+    @cached_property
+    def sparse_fieldset(self):
+        """Пара множеств (fields, exclude) или None, если ответ полный."""
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        fields, exclude = (
+            set(filter(None, self.request.query_params.get(
+                param, ''
+            ).split(',')))
+            for param in ('fields', 'exclude')
+        )
+        if not fields and not exclude:
+            return None
+        return fields, exclude
+
+    def wants(self, name):
+        """Попадёт ли поле ``name`` в ответ."""
+        if self.sparse_fieldset is None:
+            return True
+        fields, exclude = self.sparse_fieldset
+        return (not fields or name in fields) and name not in exclude
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fieldset'] = self.sparse_fieldset
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fieldset is None:
+            return queryset
+        model = queryset.model
+        names = {model._meta.pk.name, *self.sparse_model_fields}
+        for field in self.get_serializer().fields.values():
+            if field.write_only:
+                continue
+            source = field.field_name if field.source == '*' else field.source
+            try:
+                model_field = model._meta.get_field(source.split('.')[0])
+            except FieldDoesNotExist:
+                # Поле вычисляется из неизвестных атрибутов: без only().
+                return queryset
+            if model_field.concrete and not model_field.many_to_many:
+                names.add(model_field.name)
+        return queryset.only(*names)
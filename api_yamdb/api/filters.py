@@ -1,31 +1,162 @@
 import django_filters
+from django import forms
+from django.db.models import Count, F
+from django_filters.constants import EMPTY_VALUES
+from rest_framework import filters
 
-from categories.models import Category, Genre, Title
+from api.cache import resolve_slugs
+from categories.models import Title
+from search.backends import get_backend
+from search.documents import get_document
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Замена SearchFilter: ``?search=`` ищет по полнотекстовому индексу
+    и сортирует по релевантности, только по полям из ``search_fields``.
+    Без бэкенда поиска или если в индексе нет какого-то из этих полей
+    работает как обычный SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        backend = get_backend()
+        document = get_document(queryset.model)
+        fields = [
+            field.lstrip(''.join(self.lookup_prefixes))
+            for field in self.get_search_fields(view, request) or ()
+        ]
+        if (
+            not terms
+            or backend is None
+            or document is None
+            or not fields
+            or not set(fields) <= document.fields.keys()
+        ):
+            return super().filter_queryset(request, queryset, view)
+        return backend.filter(queryset, document, ' '.join(terms), fields)
+
+
+class StoredFieldOrderingFilter(filters.OrderingFilter):
+    """``?ordering=`` только по сохранённым и проиндексированным полям.
+
+    Имена из ``ordering_fields`` вьюсета переводятся в поля модели через
+    ``ordering_aliases``, в конец добавляется ``pk`` в том же направлении,
+    что и последнее поле: это делает порядок однозначным для пагинации
+    и совпадает с индексами вида (поле, id). Пустые значения nullable
+    полей при сортировке по убыванию идут в конце на любой СУБД.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        aliases = getattr(view, 'ordering_aliases', {})
+        expressions = []
+        for term in ordering:
+            name = aliases.get(term.lstrip('-'), term.lstrip('-'))
+            if not term.startswith('-'):
+                expressions.append(F(name).asc())
+            elif queryset.model._meta.get_field(name).null:
+                expressions.append(F(name).desc(nulls_last=True))
+            else:
+                # NULLS LAST эмулируется выражением и отключает индекс.
+                expressions.append(F(name).desc())
+        expressions.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        return expressions
+
+
+class SlugListField(forms.Field):
+    """Список слагов: ``?genre=a&genre=b`` или ``?genre=a,b``."""
+
+    widget = forms.SelectMultiple
+
+    def to_python(self, value):
+        slugs = []
+        for item in value or ():
+            slugs.extend(slug.strip() for slug in item.split(','))
+        return [slug for slug in dict.fromkeys(slugs) if slug]
+
+
+class SlugIdFilter(django_filters.Filter):
+    """Фильтр по слагам связанной модели.
+
+    Слаги переводятся в id через кэш каталога, после чего фильтрация идёт
+    по ``<field>_id`` или по id в промежуточной таблице many-to-many, без
+    JOIN и ``LIKE`` по таблице связанной модели. Несколько значений
+    объединяются через ИЛИ, с ``conjoined=True`` — через И.
+    """
+
+    field_class = SlugListField
+
+    def __init__(self, *args, resource, conjoined=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.resource = resource
+        self.conjoined = conjoined
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        field = qs.model._meta.get_field(self.field_name)
+        ids = set(
+            resolve_slugs(field.related_model, self.resource, value).values()
+        )
+        if not ids or self.conjoined and len(ids) < len(value):
+            return qs.none()
+        if not field.many_to_many:
+            return qs.filter(**{f'{field.attname}__in': ids})
+        source = f'{field.m2m_field_name()}_id'
+        target = f'{field.m2m_reverse_field_name()}_id'
+        links = field.remote_field.through.objects.filter(
+            **{f'{target}__in': ids}
+        ).values(source)
+        if self.conjoined:
+            links = links.annotate(
+                matched=Count(target, distinct=True)
+            ).filter(matched=len(ids))
+        return qs.filter(pk__in=links.values(source))
 
 
 class TitleFilter(django_filters.FilterSet):
-    genre = django_filters.ModelMultipleChoiceFilter(
-        field_name='genre__slug',
-        to_field_name='slug',
-        queryset=Genre.objects.all(),
-        lookup_expr='icontains',
+    genre = SlugIdFilter(field_name='genre', resource='genres')
+    genre_all = SlugIdFilter(
+        field_name='genre', resource='genres', conjoined=True
     )
-    category = django_filters.ModelMultipleChoiceFilter(
-        field_name='category__slug',
-        to_field_name='slug',
-        queryset=Category.objects.all(),
-        lookup_expr='icontains',
+    category = SlugIdFilter(field_name='category', resource='categories')
+    # Прежний поиск подстроки в слаге, только по явному запросу.
+    genre__icontains = django_filters.CharFilter(
+        field_name='genre__slug', lookup_expr='icontains', distinct=True
     )
-    name = django_filters.CharFilter(
-        field_name='name', lookup_expr='icontains'
+    category__icontains = django_filters.CharFilter(
+        field_name='category__slug', lookup_expr='icontains'
     )
+    name = django_filters.CharFilter(method='filter_name')
     year = django_filters.NumberFilter(field_name='year', lookup_expr='exact')
+    year_min = django_filters.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
 
     class Meta:
         model = Title
         fields = (
             'genre',
+            'genre_all',
             'category',
+            'genre__icontains',
+            'category__icontains',
             'name',
             'year',
+            'year_min',
+            'year_max',
+        )
+
+    @staticmethod
+    def filter_name(queryset, name, value):
+        backend = get_backend()
+        if backend is None:
+            return queryset.filter(name__icontains=value)
+        return backend.filter(
+            queryset, get_document(Title), value, fields=('name',)
         )
@@ -0,0 +1,135 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу (pub_date, id).
+
+    Следующая страница выбирается условием ``(pub_date, id) > (p, i)``
+    по индексу pub_date, без COUNT(*) и OFFSET, поэтому стоимость
+    страницы не зависит от её глубины.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    date_field = 'pub_date'
+    invalid_cursor_message = 'Неверный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            ordering = (f'-{self.date_field}', '-id')
+            lookup = 'lt'
+        else:
+            ordering = (self.date_field, 'id')
+            lookup = 'gt'
+        if position is not None:
+            date, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{self.date_field}__{lookup}': date})
+                | Q(**{self.date_field: date, f'id__{lookup}': pk})
+            )
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            date, pk, reverse = json.loads(
+                base64.urlsafe_b64decode(encoded.encode()).decode()
+            )
+            date = parse_datetime(date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (date, pk), bool(reverse)
+
+    def encode_cursor(self, instance, reverse):
+        position = [
+            getattr(instance, self.date_field).isoformat(),
+            instance.pk,
+            reverse,
+        ]
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(position).encode()
+        ).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+
+class PageNumberOrKeysetPagination(BasePagination):
+    """Постраничная пагинация по умолчанию; с ``?pagination=cursor``
+    или ``?cursor=...`` включается пагинация по ключу.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_mode = 'cursor'
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.active = self.page_number
+
+    def uses_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.keyset_mode
+            or self.keyset.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.uses_keyset(request):
+            self.active = self.keyset
+            paginated = self.keyset.paginate_queryset(queryset, request, view)
+            self.keyset.base_url = remove_query_param(
+                self.keyset.base_url, self.mode_query_param
+            )
+            return paginated
+        self.active = self.page_number
+        return self.page_number.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
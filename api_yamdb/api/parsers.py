@@ -0,0 +1,42 @@
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from api.renderers import (
+    FastJSONRenderer, MessagePackRenderer, msgpack, orjson,
+)
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser на orjson; без orjson — на стандартном ``json``.
+
+    orjson читает только UTF-8, поэтому тело в другой кодировке тоже
+    разбирается стандартным парсером.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(parsers.BaseParser):
+    """Тело запроса в MessagePack (``Content-Type: application/msgpack``).
+    Нужен пакет msgpack.
+    """
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except ValueError as exc:
+            # Часть исключений msgpack (FormatError, StackError) без текста.
+            detail = str(exc) or type(exc).__name__
+            raise ParseError('MessagePack parse error - %s' % detail)
@@ -1,14 +1,17 @@
 import uuid
 
-from django.core.mail import send_mail
+from django.db import transaction
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import cached_property
 from rest_framework import exceptions, filters, serializers
 from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from core import metrics
+from users.authentication import access_token_for
 from users.models import User
 from categories.models import Category, Genre, Title
-from reviews.models import Comment, Review
-from api_yamdb.settings import SENDER
+from reviews.models import Comment, Review, TitleStats
+from users.outbox import enqueue_email
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -36,30 +39,33 @@ class RegisterSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        confirmation_code = str(uuid.uuid4())
+        with transaction.atomic():
+            user = User.objects.create(
+                username=validated_data['username'],
+                email=validated_data['email'],
+            )
+            self.send_confirmation_code(user)
+        metrics.SIGNUPS.labels('new').inc()
+        return user
+
+    @staticmethod
+    def send_confirmation_code(user):
+        """Выдаёт пользователю новый код подтверждения и ставит письмо
+        с ним в очередь.
+        """
+        user.confirmation_code = uuid.uuid4().hex
+        user.save(update_fields=('confirmation_code',))
         confirmation_message = (
-            'Здравствуйте! Спасибо за регистрацию в проекте YaMDb. ',
-            f'Ваш код подтверждения: {confirmation_code}. ',
-            'Он понадобится для получения токена для работы с Api YaMDb.',
+            'Здравствуйте! Спасибо за регистрацию в проекте YaMDb. '
+            f'Ваш код подтверждения: {user.confirmation_code}. '
+            'Он понадобится для получения токена для работы с Api YaMDb.'
         )
-        email = validated_data['email']
-        username = validated_data['username']
-
-        send_mail(
-            'Код подтверждения регистрации',
-            f'{confirmation_message}',
-            SENDER,
-            [email],
+        enqueue_email(
+            'Код подтверждения регистрации', confirmation_message, user.email
         )
 
-        user = User.objects.create(
-            username=username, email=email, confirmation_code=confirmation_code
-        )
-        return user
-
 
-class GetTokenSerializer(serializers.ModelSerializer):
-    id = serializers.SerializerMethodField()
+class GetTokenSerializer(serializers.Serializer):
     username = serializers.CharField(
         max_length=150,
         allow_blank=False,
@@ -68,41 +74,35 @@ class GetTokenSerializer(serializers.ModelSerializer):
         max_length=150,
         allow_blank=False,
     )
-    token = serializers.SerializerMethodField()
-
-    class Meta:
-        model = User
-        fields = ('id', 'username', 'confirmation_code', 'token')
 
     def validate(self, data):
-        existing = User.objects.filter(
-            username=data['username'],
-        ).exists()
+        user = User.objects.filter(username=data['username']).first()
 
-        if not existing:
+        if user is None:
             raise exceptions.NotFound('Пользователь не найден')
 
-        user = User.objects.get(username=data['username'])
-
-        if not user.confirmation_code == data['confirmation_code']:
+        if not user.confirmation_code or not constant_time_compare(
+            user.confirmation_code, data['confirmation_code']
+        ):
             raise exceptions.ParseError('Код подтверждения не верный')
+        data['user'] = user
         return data
 
-    @staticmethod
-    def get_token(obj):
-        username = list(obj.items())[0][1]
-        confirmation_code = list(obj.items())[1][1]
-        user = User.objects.get(
-            username=username, confirmation_code=confirmation_code
-        )
-        refresh = RefreshToken.for_user(user)
-        return str(refresh.access_token)
+    def create(self, validated_data):
+        user = validated_data['user']
+        # Код одноразовый: условный UPDATE не даст использовать его
+        # дважды даже при параллельных запросах.
+        used = User.objects.filter(
+            pk=user.pk, confirmation_code=user.confirmation_code
+        ).update(confirmation_code='')
+        if not used:
+            raise exceptions.ParseError('Код подтверждения не верный')
+        metrics.TOKENS_ISSUED.inc()
+        return {'token': self.get_token(user)}
 
     @staticmethod
-    def get_id(obj):
-        username = list(obj.items())[0][1]
-        user = User.objects.get(username=username)
-        return user.id
+    def get_token(user):
+        return str(access_token_for(user))
 
 
 class AdminUserSerializer(serializers.ModelSerializer):
@@ -159,17 +159,59 @@ class FromContext(object):
         return self.value
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Отбирает поля по ``context['sparse_fieldset']``
+    (см. ``api.fieldsets.SparseFieldsetMixin``).
+
+    Поля убираются из готового ``fields``, то есть после всех
+    ``get_fields()`` сериализатора (например, без ``stats`` у
+    TitleSerializer, если статистику не запросили).
+    """
+
+    @cached_property
+    def fields(self):
+        fields = super().fields
+        fieldset = self.context.get('sparse_fieldset')
+        if fieldset is None:
+            return fields
+        only, exclude = fieldset
+        readable = {
+            name for name, field in fields.items() if not field.write_only
+        }
+        unknown = (only | exclude) - readable
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': 'Неизвестные поля: %s' % ', '.join(sorted(unknown))
+            })
+        for name in readable:
+            if only and name not in only or name in exclude:
+                del fields[name]
+        return fields
+
+
+class UpdateFieldsMixin:
+    """При обновлении сохраняет только переданные поля: UPDATE не
+    перезаписывает остальные столбцы, а обработчики ``post_save`` видят
+    ``update_fields``.
+    """
+
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
+
+class ReviewSerializer(
+    SparseFieldsMixin, UpdateFieldsMixin, serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         default=serializers.CurrentUserDefault(),
         slug_field='username',
         read_only=True,
     )
-    title = serializers.SlugRelatedField(
-        slug_field='name',
-        read_only=True,
-        default=FromContext(
-            lambda context: context.get('view').kwargs['title_id'])
+    title = serializers.HiddenField(
+        default=FromContext(lambda context: context.get('view').title)
     )
 
     class Meta:
@@ -189,13 +231,25 @@ class ReviewSerializer(serializers.ModelSerializer):
             ),
         )
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data.pop('title')
-        return data
-
-
-class CommentSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.instance is not None:
+            # Произведение отзыва не меняется: иначе при PUT оно
+            # загружалось бы отдельным запросом.
+            fields.pop('title')
+        return fields
+
+    def get_validators(self):
+        # Автор и произведение при изменении отзыва те же, поэтому
+        # уникальность проверяется только при создании.
+        if self.instance is not None:
+            return []
+        return super().get_validators()
+
+
+class CommentSerializer(
+    SparseFieldsMixin, UpdateFieldsMixin, serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
     )
@@ -224,7 +278,59 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleStatsSerializer(serializers.ModelSerializer):
+    scores = serializers.DictField(
+        source='histogram', child=serializers.IntegerField(), read_only=True
+    )
+
+    class Meta:
+        model = TitleStats
+        fields = (
+            'review_count',
+            'last_review_at',
+            'scores',
+        )
+
+
+def get_title_stats(title):
+    """Статистика произведения; нулевая, если её строки ещё нет."""
+    try:
+        return title.stats
+    except TitleStats.DoesNotExist:
+        return TitleStats(title=title)
+
+
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    genre = GenreSerializer(many=True, read_only=True)
+    category = CategorySerializer(read_only=True)
+    rating = serializers.IntegerField(read_only=True)
+    stats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = (
+            'id',
+            'name',
+            'year',
+            'description',
+            'genre',
+            'category',
+            'rating',
+            'stats',
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Статистика отдаётся только по запросу (?stats=true).
+        if not self.context.get('with_stats'):
+            fields.pop('stats')
+        return fields
+
+    def get_stats(self, title):
+        return TitleStatsSerializer(get_title_stats(title)).data
+
+
+class TitleWriteSerializer(serializers.ModelSerializer):
     genre = serializers.SlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
@@ -234,7 +340,6 @@ class TitleSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         slug_field='slug', queryset=Category.objects.all(), required=True
     )
-    rating = serializers.IntegerField(required=False)
 
     class Meta:
         model = Title
@@ -245,17 +350,25 @@ class TitleSerializer(serializers.ModelSerializer):
             'description',
             'genre',
             'category',
-            'rating',
         )
 
     def to_representation(self, instance):
-        data = super().to_representation(instance)
-        genre_list = []
-        for genre_data in data['genre']:
-            genre = GenreSerializer(Genre.objects.get(slug=genre_data)).data
-            genre_list.append(genre)
-        data['genre'] = genre_list
-        data['category'] = CategorySerializer(
-            Category.objects.get(slug=data['category'])
-        ).data
-        return data
+        return TitleSerializer(instance, context=self.context).data
+
+
+class SearchReviewSerializer(ReviewSerializer):
+    title_id = serializers.IntegerField(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title_id',)
+        validators = ()
+
+
+class SearchCommentSerializer(CommentSerializer):
+    review_id = serializers.IntegerField(read_only=True)
+    title_id = serializers.IntegerField(
+        source='review.title_id', read_only=True
+    )
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('review_id', 'title_id')
@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api import cache
+from categories.models import Category, Genre, Title, TitleGenre
+from reviews.models import Comment, Review
+
+
+def bump(resource, pk=None):
+    # Сдвиг версии после коммита, иначе параллельный запрос может
+    # закэшировать ещё не закоммиченные данные под новой версией.
+    transaction.on_commit(lambda: cache.bump(resource, pk))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    bump('categories')
+    bump('titles')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genre(sender, instance, **kwargs):
+    bump('genres')
+    bump('titles')
+
+
+def invalidate_title_by_id(title_id):
+    bump('titles', 'list')
+    if title_id is not None:
+        bump('titles', title_id)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    invalidate_title_by_id(instance.pk)
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def invalidate_title_relation(sender, instance, **kwargs):
+    invalidate_title_by_id(instance.title_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    invalidate_title_by_id(instance.title_id)
+    bump('reviews', instance.title_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    bump('comments', instance.review_id)
+
+
+@receiver(m2m_changed, sender=TitleGenre)
+def invalidate_title_genres(sender, instance, action, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Title):
+        invalidate_title_by_id(instance.pk)
+    else:
+        bump('titles')
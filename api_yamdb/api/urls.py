@@ -2,9 +2,11 @@ from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from api.views import ExportView, cache_stats, request_stats
 from users.views import RegisterView, UserView, AdminViewSet, get_token
 from reviews.views import ReviewViewSet, CommentViewSet
 from categories.views import CategoryViewSet, GenreViewSet, TitleViewSet
+from search.views import SearchView
 
 
 router_v1 = SimpleRouter()
@@ -29,5 +31,13 @@ urlpatterns = [
     ),
     path('v1/auth/signup/', RegisterView.as_view(), name='auth_register'),
     path('v1/users/me/', UserView.as_view(), name='user_me'),
+    path('v1/cache/stats/', cache_stats, name='cache_stats'),
+    path('v1/profiling/stats/', request_stats, name='request_stats'),
+    path('v1/search/', SearchView.as_view(), name='search'),
+    path(
+        'v1/export/<str:resource>.<str:export_format>',
+        ExportView.as_view(),
+        name='export',
+    ),
     path('v1/', include(router_v1.urls)),
 ]
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api import cache
+from api.exports import EXPORTS, FORMATS
+from api.permissions import OnlyAdminAndSuperuser
+from core import profiling
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, OnlyAdminAndSuperuser])
+def cache_stats(request):
+    return Response(cache.stats.as_dict(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated, OnlyAdminAndSuperuser])
+def request_stats(request):
+    if request.method == 'DELETE':
+        profiling.stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(profiling.stats.as_dict(), status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка отзывов, комментариев или произведений в NDJSON
+    или CSV одним запросом: строки читаются серверным курсором пачками
+    по ``EXPORT_CHUNK_SIZE`` и сразу отдаются клиенту, без COUNT(*) и
+    OFFSET постраничного API.
+    """
+
+    permission_classes = (permissions.IsAuthenticated, OnlyAdminAndSuperuser)
+    read_from_replicas = True
+
+    def get(self, request, resource, export_format):
+        if resource not in EXPORTS or export_format not in FORMATS:
+            raise Http404
+        export = EXPORTS[resource]
+        content_type, lines = FORMATS[export_format]
+        queryset = export.get_queryset(request.query_params)
+        # Строки читаются уже после выхода из view: база (реплика или
+        # основная) выбирается сейчас.
+        queryset = queryset.using(queryset.db)
+        response = StreamingHttpResponse(
+            lines(
+                export,
+                export.chunks(queryset, settings.EXPORT_CHUNK_SIZE),
+            ),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{export_format}"'
+        )
+        return response
@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -21,11 +22,12 @@ ALLOWED_HOSTS = ['*']
 # Application definition
 
 INSTALLED_APPS = [
-    'core',
+    'core.apps.CoreConfig',
     'users.apps.UsersConfig',
     'api.apps.ApiConfig',
     'categories.apps.CategoriesConfig',
     'reviews.apps.ReviewsConfig',
+    'search.apps.SearchConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -38,6 +40,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -45,6 +49,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -70,12 +75,143 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
 # Database
+# Параметры берутся из окружения (.env). DB_ENGINE=postgresql включает
+# PostgreSQL (нужен psycopg2), по умолчанию используется SQLite.
+# DB_REPLICAS — реплики для чтения через запятую: хосты (host[:port])
+# для PostgreSQL или пути к файлам для SQLite.
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE.rsplit('.', 1)[-1] == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'postgres'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Постоянные соединения: одно на поток воркера.
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv(
+                'DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')
+            ),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+        }
+    }
+
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica_{number}'] = dict(
+        DATABASES['default'],
+        # В тестах реплика — та же тестовая БД.
+        TEST={'MIRROR': 'default'},
+        **(
+            dict(zip(('HOST', 'PORT'), replica.strip().split(':')))
+            if DATABASES['default']['ENGINE'].endswith('postgresql')
+            else {'NAME': replica.strip()}
+        ),
+    )
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+
+# Сколько секунд после записи клиент читает из основной БД, а не с
+# реплик; должно перекрывать отставание реплик.
+DB_REPLICA_PIN_SECONDS = float(os.getenv('DB_REPLICA_PIN_SECONDS', 5))
+
+# Проверка постоянного соединения в начале запроса: разорванное
+# соединение закрывается, и Django откроет новое.
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', '1') == '1'
+
+# SQLite: WAL позволяет читать во время записи, busy_timeout ждёт
+# блокировку вместо ошибки «database is locked».
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+
 
-DATABASES = {
+# Cache
+
+CACHES = {
+    # Общий кэш: версии JWT-токенов, закрепление за основной БД. С
+    # locmem он свой у каждого процесса; для нескольких воркеров задайте
+    # общий бэкенд (filebased, Redis-совместимый).
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    },
+    # Кэш ответов каталога (категории, жанры, произведения). Бэкенд
+    # задаётся окружением: locmem, filebased или Redis-совместимый.
+    'catalog': {
+        'BACKEND': os.getenv(
+            'CATALOG_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('CATALOG_CACHE_LOCATION', 'catalog'),
+        'TIMEOUT': int(os.getenv('CATALOG_CACHE_TIMEOUT', 300)),
+    },
+}
+
+
+# Full-text search: путь к бэкенду из search.backends; по умолчанию
+# выбирается по типу БД, пустая строка отключает полнотекстовый поиск.
+
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND')
+
+SEARCH_POSTGRES_CONFIG = os.getenv('SEARCH_POSTGRES_CONFIG', 'simple')
+
+
+# Байесовский рейтинг произведений: средняя оценка, притянутая к
+# RATING_PRIOR_MEAN с весом RATING_PRIOR_WEIGHT «виртуальных» отзывов.
+# После изменения нужно выполнить rebuild_title_ratings.
+
+RATING_PRIOR_MEAN = float(os.getenv('RATING_PRIOR_MEAN', 5.5))
+
+RATING_PRIOR_WEIGHT = float(os.getenv('RATING_PRIOR_WEIGHT', 5))
+
+
+# Профилирование запросов (core.middleware): доля профилируемых запросов
+# и число самых медленных SQL-запросов в логе.
+
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING', '') == '1'
+
+REQUEST_PROFILING_SAMPLE_RATE = float(
+    os.getenv('REQUEST_PROFILING_SAMPLE_RATE', 0.1)
+)
+
+REQUEST_PROFILING_SLOW_QUERIES = int(
+    os.getenv('REQUEST_PROFILING_SLOW_QUERIES', 3)
+)
+
+# Метрики Prometheus на /metrics (core.metrics). Для нескольких
+# воркеров задайте PROMETHEUS_MULTIPROC_DIR — общую папку для их файлов.
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '') == '1'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
 
@@ -121,12 +257,33 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
 
+# MessagePack (application/msgpack) включается, если установлен msgpack.
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
+        'api.renderers.MessagePackRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append(
+        'api.parsers.MessagePackParser'
+    )
+
+# Строк в одной пачке потоковой выгрузки /api/v1/export/.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
 
 # Authorization
 
@@ -137,6 +294,21 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько проверенных токенов держать в LRU каждого процесса.
+JWT_VERIFIED_TOKENS = int(os.getenv('JWT_VERIFIED_TOKENS', 1024))
+
+# Сколько секунд версия токенов пользователя хранится в общем кэше
+# (CACHE_BACKEND). Сигнал сбрасывает её сразу после коммита, так что
+# это только верхняя граница на случай гонки чтения со сбросом.
+JWT_TOKEN_VERSION_TIMEOUT = int(os.getenv('JWT_TOKEN_VERSION_TIMEOUT', 60))
+# То же для locmem, где кэш у каждого процесса свой: сброс виден только
+# воркеру, изменившему пользователя, а остальные принимают отозванный
+# токен не дольше этого времени. 0 — читать версию из БД на каждый
+# запрос.
+JWT_TOKEN_VERSION_LOCAL_TIMEOUT = int(
+    os.getenv('JWT_TOKEN_VERSION_LOCAL_TIMEOUT', 5)
+)
+
 
 # Global variables
 
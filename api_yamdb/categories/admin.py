@@ -8,7 +8,10 @@ class GenreInline(admin.TabularInline):
 
 
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'name', 'description', 'category')
+    list_display = ('pk', 'name', 'description', 'category', 'rating')
+    readonly_fields = (
+        'rating_sum', 'rating_count', 'rating', 'weighted_rating',
+    )
     search_fields = ('name',)
     list_filter = ('name',)
     empty_value_display = '-пусто-'
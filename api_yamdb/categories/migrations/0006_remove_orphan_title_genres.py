@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def remove_orphan_title_genres(apps, schema_editor):
+    from django.db.models import Min, Q
+
+    TitleGenre = apps.get_model('categories', 'TitleGenre')
+    TitleGenre.objects.filter(
+        Q(title__isnull=True) | Q(genre__isnull=True)
+    ).delete()
+    first_links = TitleGenre.objects.order_by().values(
+        'title_id', 'genre_id'
+    ).annotate(first_pk=Min('pk')).values('first_pk')
+    TitleGenre.objects.exclude(pk__in=first_links).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0005_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_orphan_title_genres, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def populate_weighted_rating(apps, schema_editor):
+    from django.conf import settings
+    from django.db.models import F, FloatField
+    from django.db.models.functions import Cast
+
+    Title = apps.get_model('categories', 'Title')
+    mean = settings.RATING_PRIOR_MEAN
+    weight = settings.RATING_PRIOR_WEIGHT
+    Title.objects.filter(rating_count=0).update(weighted_rating=mean)
+    Title.objects.filter(rating_count__gt=0).update(
+        weighted_rating=(Cast('rating_sum', FloatField()) + weight * mean)
+        / (Cast(F('rating_count'), FloatField()) + weight)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0008_title_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            populate_weighted_rating, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+def populate_rating_sort(apps, schema_editor):
+    Title = apps.get_model('categories', 'Title')
+    Title.objects.filter(rating__isnull=False).update(
+        rating_sort=models.F('rating')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0009_populate_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_rating_idx',
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sort',
+            field=models.FloatField(default=0, editable=False, verbose_name='Рейтинг для сортировки'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_sort', 'id'], name='title_rating_sort_idx'),
+        ),
+        migrations.RunPython(populate_rating_sort, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 
 
@@ -41,10 +42,16 @@ class Category(models.Model):
         return self.name
 
 
+def default_weighted_rating():
+    # Без отзывов взвешенный рейтинг равен априорной средней оценке.
+    return settings.RATING_PRIOR_MEAN
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=48,
-        verbose_name='Название произведения'
+        verbose_name='Название произведения',
+        db_index=True
     )
     year = models.IntegerField(
         verbose_name='Год',
@@ -67,11 +74,53 @@ class Title(models.Model):
         verbose_name='Категория произведения',
         null=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+    )
+    # Рейтинг без NULL: у произведений без оценок 0, поэтому при
+    # сортировке по убыванию они идут в конце и индекс (rating_sort, id)
+    # читается в обратном порядке без эмуляции NULLS LAST.
+    rating_sort = models.FloatField(
+        verbose_name='Рейтинг для сортировки',
+        default=0,
+        editable=False,
+    )
+    weighted_rating = models.FloatField(
+        verbose_name='Взвешенный рейтинг',
+        default=default_weighted_rating,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year',)
+        # Индексы под ?ordering= списка произведений; id в конце
+        # индекса обслуживает сортировку при равных значениях.
+        indexes = (
+            models.Index(
+                fields=('rating_sort', 'id'), name='title_rating_sort_idx'
+            ),
+            models.Index(
+                fields=('weighted_rating', 'id'),
+                name='title_weighted_rating_idx',
+            ),
+            models.Index(
+                fields=('rating_count', 'id'), name='title_rating_count_idx'
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -80,16 +129,33 @@ class Title(models.Model):
 class TitleGenre(models.Model):
     title = models.ForeignKey(
         Title,
-        on_delete=models.SET_NULL,
+        on_delete=models.CASCADE,
         verbose_name='Произведение',
-        null=True,
+        db_index=False,
     )
     genre = models.ForeignKey(
         Genre,
-        on_delete=models.SET_NULL,
+        on_delete=models.CASCADE,
         verbose_name='Жанр произведения',
-        null=True,
+        db_index=False,
     )
 
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'),
+                name='unique_title_genre',
+            ),
+        )
+        # Уникальный индекс (title_id, genre_id) обслуживает жанры
+        # произведения, обратный — фильтр произведений по жанру, поэтому
+        # отдельные индексы внешних ключей не нужны.
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'),
+                name='titlegenre_genre_title_idx',
+            ),
+        )
+
     def __str__(self):
         return f'{self.genre} {self.title}'
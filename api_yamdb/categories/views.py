@@ -1,19 +1,30 @@
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Avg
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import exceptions, filters, viewsets
+from rest_framework import exceptions, filters, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from api.cache import CatalogCacheMixin
+from api.conditional import ConditionalGetMixin
+from api.fieldsets import SparseFieldsetMixin
 from api.permissions import IsAdminSuperuserOrReadOnly
 from categories.models import Category, Genre, Title
-from api.filters import TitleFilter
+from core.profiling import ProfiledSerializerMixin
+from api.filters import (
+    FullTextSearchFilter, StoredFieldOrderingFilter, TitleFilter,
+)
 from api.serializers import (
     CategorySerializer,
     GenreSerializer,
     TitleSerializer,
+    TitleStatsSerializer,
+    TitleWriteSerializer,
+    get_title_stats,
 )
 
 
-class CategoryGenreViewSet(viewsets.ModelViewSet):
+class CategoryGenreViewSet(ProfiledSerializerMixin, viewsets.ModelViewSet):
     def get_object(self):
         queryset = self.filter_queryset(self.get_queryset())
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
@@ -25,7 +36,9 @@ class CategoryGenreViewSet(viewsets.ModelViewSet):
             raise exceptions.MethodNotAllowed(method='GET')
 
 
-class CategoryViewSet(CategoryGenreViewSet):
+class CategoryViewSet(CatalogCacheMixin, CategoryGenreViewSet):
+    read_from_replicas = True
+    cache_resource = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = 'slug'
@@ -34,7 +47,9 @@ class CategoryViewSet(CategoryGenreViewSet):
     search_fields = ('name',)
 
 
-class GenreViewSet(CategoryGenreViewSet):
+class GenreViewSet(CatalogCacheMixin, CategoryGenreViewSet):
+    read_from_replicas = True
+    cache_resource = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     lookup_field = 'slug'
@@ -43,14 +58,54 @@ class GenreViewSet(CategoryGenreViewSet):
     search_fields = ('name',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    serializer_class = TitleSerializer
+class TitleViewSet(
+    SparseFieldsetMixin, ConditionalGetMixin, CatalogCacheMixin,
+    ProfiledSerializerMixin, viewsets.ModelViewSet,
+):
+    read_from_replicas = True
+    cache_resource = 'titles'
+    cache_per_object = True
     permission_classes = (IsAdminSuperuserOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    filter_backends = (
+        DjangoFilterBackend, FullTextSearchFilter, StoredFieldOrderingFilter,
+    )
     filterset_class = TitleFilter
     search_fields = ('name',)
+    ordering_fields = (
+        'rating', 'weighted_rating', 'review_count', 'year', 'name',
+    )
+    ordering_aliases = {
+        'rating': 'rating_sort', 'review_count': 'rating_count',
+    }
 
     def get_queryset(self):
-        return Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-            'name'
-        )
+        queryset = Title.objects.order_by('name')
+        if self.wants('category'):
+            queryset = queryset.select_related('category')
+        if self.wants('genre'):
+            queryset = queryset.prefetch_related('genre')
+        if self.with_stats and self.wants('stats'):
+            queryset = queryset.select_related('stats')
+        return queryset
+
+    @property
+    def with_stats(self):
+        return self.request.query_params.get('stats') in ('true', '1')
+
+    def get_serializer_class(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return TitleSerializer
+        return TitleWriteSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['with_stats'] = self.with_stats
+        return context
+
+    @action(detail=True)
+    def stats(self, request, pk=None):
+        return self.cached_response(self.title_stats, request, pk=pk)
+
+    def title_stats(self, request, pk=None):
+        title = get_object_or_404(Title.objects.select_related('stats'), pk=pk)
+        return Response(TitleStatsSerializer(get_title_stats(title)).data)
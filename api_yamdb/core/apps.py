@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from core.db import check_connections, configure_sqlite
+
+        connection_created.connect(configure_sqlite)
+        request_started.connect(check_connections)
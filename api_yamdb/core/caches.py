@@ -0,0 +1,9 @@
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared(cache):
+    """Видны ли данные кэша всем процессам: locmem хранит их в памяти
+    одного воркера, а dummy не хранит вовсе.
+    """
+    return not isinstance(cache, (LocMemCache, DummyCache))
@@ -0,0 +1,126 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+local = threading.local()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Настраивает каждое новое соединение SQLite: WAL, synchronous
+    и busy_timeout из настроек.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'PRAGMA journal_mode = %s' % settings.SQLITE_JOURNAL_MODE
+        )
+        cursor.execute('PRAGMA synchronous = %s' % settings.SQLITE_SYNCHRONOUS)
+        cursor.execute(
+            'PRAGMA busy_timeout = %d' % settings.SQLITE_BUSY_TIMEOUT
+        )
+
+
+def check_connections(**kwargs):
+    """Закрывает разорванные постоянные соединения в начале запроса.
+
+    Django сам закрывает соединение только после ошибки в нём, поэтому
+    первый запрос после перезапуска БД упал бы; здесь оно проверяется
+    заранее, и Django откроет новое при первом обращении.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict['CONN_MAX_AGE'] != 0
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != 'default']
+
+
+class ReplicaPool:
+    """Выдаёт реплики по кругу. ``itertools.count`` атомарен под GIL,
+    поэтому блокировка не нужна.
+    """
+
+    def __init__(self, aliases):
+        self.aliases = list(aliases)
+        self.counter = itertools.count()
+
+    def next(self):
+        if not self.aliases:
+            return None
+        return self.aliases[next(self.counter) % len(self.aliases)]
+
+
+def current_replica():
+    """Реплика, на которую сейчас идут чтения, или None."""
+    return getattr(local, 'replica', None)
+
+
+@contextmanager
+def use_replica(alias):
+    """Чтения внутри блока идут на реплику ``alias`` (None — на основную
+    БД).
+    """
+    previous = current_replica()
+    local.replica = alias
+    try:
+        yield
+    finally:
+        local.replica = previous
+
+
+def replica_may_lag(versions):
+    """Изменён ли ресурс (по версиям из ``api.cache``) так недавно, что
+    реплика может ещё не содержать изменений.
+    """
+    window = settings.DB_REPLICA_PIN_SECONDS * 10 ** 9
+    return (
+        current_replica() is not None
+        and time.time_ns() - max(versions) < window
+    )
+
+
+@contextmanager
+def primary_if_changed(versions):
+    """Читает из основной БД, если ресурс только что изменился.
+
+    Ответ, прочитанный с отстающей реплики, попал бы в кэш каталога
+    или получил бы ETag под новой версией и оставался бы устаревшим
+    до следующего изменения.
+    """
+    if replica_may_lag(versions):
+        with use_replica(None):
+            yield
+    else:
+        yield
+
+
+class ReplicaRouter:
+    """Отправляет чтения внутри ``use_replica()`` на выбранную реплику,
+    всё остальное — на ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_replica()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная БД.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
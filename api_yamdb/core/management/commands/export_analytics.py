@@ -0,0 +1,225 @@
+import os
+import time
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from categories.models import Category, Genre, Title, TitleGenre
+from reviews.models import Comment, Review
+from reviews.ratings import weighted_mean
+
+
+class Totals:
+    """Суммы по целочисленным id в массиве numpy.
+
+    Память зависит от максимального id, а не от количества строк, поэтому
+    отзывы можно прогонять через счётчики пачками любого размера.
+    """
+
+    def __init__(self):
+        self.values = np.zeros(0)
+
+    def add(self, ids, weights=None):
+        sums = np.bincount(ids, weights=weights)
+        if len(sums) > len(self.values):
+            self.values = np.pad(
+                self.values, (0, len(sums) - len(self.values))
+            )
+        self.values[:len(sums)] += sums
+
+    def take(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        result = np.zeros(len(ids))
+        known = ids < len(self.values)
+        result[known] = self.values[ids[known]]
+        return result
+
+
+def chunks(queryset, size):
+    """Строки ``values_list`` пачками в виде массивов int64 (строка —
+    запись, столбец — поле).
+    """
+    rows = queryset.iterator(chunk_size=size)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield np.array(chunk, dtype=np.int64).reshape(len(chunk), -1)
+
+
+def frame(queryset, columns, size):
+    return pd.DataFrame.from_records(
+        queryset.values_list(*columns).iterator(chunk_size=size),
+        columns=columns,
+    )
+
+
+def group_ratings(titles, key):
+    """Рейтинги группы произведений: средняя оценка по всем отзывам группы
+    и средний взвешенный рейтинг её произведений.
+    """
+    grouped = titles.groupby(key).agg(
+        titles=('title_id', 'size'),
+        reviews=('reviews', 'sum'),
+        score_sum=('score_sum', 'sum'),
+        weighted_rating=('weighted_rating', 'mean'),
+    )
+    grouped['rating'] = grouped['score_sum'] / grouped['reviews'].where(
+        grouped['reviews'] > 0
+    )
+    return grouped.drop(columns='score_sum').reset_index()
+
+
+class Command(BaseCommand):
+    help = 'Exports title, genre, category, year and author analytics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='analytics',
+            help='Output directory',
+        )
+        parser.add_argument(
+            '--format',
+            choices=('csv', 'parquet'),
+            default='csv',
+            help='Output format; parquet needs pyarrow or fastparquet',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=100000,
+            help='Rows fetched from the database per chunk',
+        )
+
+    def handle(self, *args, **options):
+        size = options['chunk_size']
+        started = time.perf_counter()
+
+        title_reviews, title_scores, title_squares = (
+            Totals(), Totals(), Totals()
+        )
+        author_reviews, author_scores = Totals(), Totals()
+        streamed = 0
+        for chunk in chunks(
+            Review.objects.order_by().values_list(
+                'title_id', 'author_id', 'score'
+            ),
+            size,
+        ):
+            title_ids, author_ids, scores = chunk.T
+            title_reviews.add(title_ids)
+            title_scores.add(title_ids, scores)
+            title_squares.add(title_ids, scores.astype(np.float64) ** 2)
+            author_reviews.add(author_ids)
+            author_scores.add(author_ids, scores)
+            streamed += len(chunk)
+        self.stdout.write('Reviews streamed: %s' % streamed)
+
+        title_comments, author_comments = Totals(), Totals()
+        streamed = 0
+        for chunk in chunks(
+            Comment.objects.order_by().values_list(
+                'review__title_id', 'author_id'
+            ),
+            size,
+        ):
+            title_comments.add(chunk[:, 0])
+            author_comments.add(chunk[:, 1])
+            streamed += len(chunk)
+        self.stdout.write('Comments streamed: %s' % streamed)
+
+        titles = frame(
+            Title.objects.order_by('pk'),
+            ['id', 'name', 'year', 'category_id'],
+            size,
+        ).rename(columns={'id': 'title_id'})
+        titles['reviews'] = title_reviews.take(titles['title_id'])
+        titles['comments'] = title_comments.take(titles['title_id'])
+        titles['score_sum'] = title_scores.take(titles['title_id'])
+        counted = titles['reviews'].where(titles['reviews'] > 0)
+        titles['rating'] = titles['score_sum'] / counted
+        titles['rating_std'] = np.sqrt(
+            (title_squares.take(titles['title_id']) / counted
+             - titles['rating'] ** 2).clip(lower=0)
+        )
+        # Тот же байесовский рейтинг, что хранится в weighted_rating.
+        titles['weighted_rating'] = weighted_mean(
+            titles['score_sum'], titles['reviews']
+        ).where(titles['reviews'] > 0, settings.RATING_PRIOR_MEAN)
+
+        categories = frame(Category.objects, ['id', 'slug', 'name'], size)
+        genres = frame(Genre.objects, ['id', 'slug', 'name'], size)
+        title_genres = frame(
+            TitleGenre.objects.order_by(), ['title_id', 'genre_id'], size
+        )
+        outputs = {
+            'titles': titles.merge(
+                categories[['id', 'slug']].rename(
+                    columns={'id': 'category_id', 'slug': 'category'}
+                ),
+                on='category_id',
+                how='left',
+            ).drop(columns=['category_id', 'score_sum']),
+            'genres': genres.rename(columns={'id': 'genre_id'}).merge(
+                group_ratings(
+                    title_genres.merge(titles, on='title_id'), 'genre_id'
+                ),
+                on='genre_id',
+                how='left',
+            ),
+            'categories': categories.rename(
+                columns={'id': 'category_id'}
+            ).merge(
+                group_ratings(titles, 'category_id'),
+                on='category_id',
+                how='left',
+            ),
+            'years': group_ratings(titles, 'year'),
+        }
+
+        users = frame(
+            get_user_model().objects.order_by('pk'),
+            ['id', 'username'],
+            size,
+        ).rename(columns={'id': 'author_id'})
+        users['reviews'] = author_reviews.take(users['author_id'])
+        users['comments'] = author_comments.take(users['author_id'])
+        users['mean_score'] = author_scores.take(
+            users['author_id']
+        ) / users['reviews'].where(users['reviews'] > 0)
+        outputs['authors'] = users[
+            (users['reviews'] > 0) | (users['comments'] > 0)
+        ]
+
+        os.makedirs(options['path'], exist_ok=True)
+        for name, data in outputs.items():
+            self.write(data, options['path'], name, options['format'])
+        self.stdout.write(
+            'Analytics exported in %.2fs' % (time.perf_counter() - started)
+        )
+
+    def write(self, data, directory, name, file_format):
+        counts = data.columns.intersection(
+            ['titles', 'reviews', 'comments']
+        )
+        data = data.fillna({column: 0 for column in counts}).astype(
+            {column: 'int64' for column in counts}
+        )
+        path = os.path.join(directory, f'{name}.{file_format}')
+        if file_format == 'parquet':
+            try:
+                data.to_parquet(path, index=False)
+            except ImportError as error:
+                raise CommandError(
+                    'Parquet export needs pyarrow or fastparquet: %s' % error
+                )
+        else:
+            data.to_csv(path, index=False)
+        self.stdout.write('%s: %s rows written to %s' % (
+            name, len(data), path,
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.backends import get_backend
+from search.documents import DOCUMENTS
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index'
+
+    def handle(self, *args, **kwargs):
+        backend = get_backend()
+        if backend is None:
+            raise CommandError('No full-text search backend configured')
+        for kind, document in DOCUMENTS.items():
+            backend.rebuild(document)
+            self.stdout.write('Search index rebuilt for %s' % kind)
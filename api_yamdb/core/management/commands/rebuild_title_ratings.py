@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.signals import bump
+from reviews.ratings import rebuild_title_ratings
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds stored title ratings from reviews'
+
+    def handle(self, *args, **kwargs):
+        updated = rebuild_title_ratings()
+        # Массовое обновление идёт мимо сигналов: кэш каталога сбрасывается
+        # явно, иначе он отдаёт старые значения до истечения TTL.
+        bump('titles')
+        self.stdout.write('Ratings rebuilt for %s titles' % updated)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.signals import bump
+from reviews.stats import rebuild_title_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds stored title review statistics from reviews'
+
+    def handle(self, *args, **kwargs):
+        created = rebuild_title_stats()
+        # Массовое обновление идёт мимо сигналов: кэш каталога сбрасывается
+        # явно, иначе он отдаёт старые значения до истечения TTL.
+        bump('titles')
+        self.stdout.write('Statistics rebuilt for %s titles' % created)
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Emails claimed per batch',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Sending threads, each with its own mail connection',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait when the outbox is empty',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the outbox and exit instead of polling',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = deliver(options['batch_size'], options['workers'])
+            if result is None:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+            sent, failed = result
+            self.stdout.write('Sent %s emails, %s failed' % (sent, failed))
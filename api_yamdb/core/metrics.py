@@ -0,0 +1,112 @@
+import os
+import resource
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+    Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Метрики prometheus_client. Если задан PROMETHEUS_MULTIPROC_DIR, каждый
+# процесс пишет значения в свои mmap-файлы в этой папке, а /metrics
+# складывает их: так счётчики переживают несколько WSGI-воркеров.
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'HTTP requests by route, method and status code',
+    ('route', 'method', 'status'),
+)
+LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'HTTP request latency by route and method',
+    ('route', 'method'),
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, float('inf'),
+    ),
+)
+DB_QUERIES = Histogram(
+    'yamdb_http_request_db_queries',
+    'SQL queries per HTTP request by route',
+    ('route',),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, float('inf')),
+)
+CACHE_LOOKUPS = Counter(
+    'yamdb_catalog_cache_lookups_total',
+    'Catalog response cache lookups by result (hit or miss)',
+    ('result',),
+)
+TOKENS_ISSUED = Counter(
+    'yamdb_jwt_tokens_issued_total',
+    'JWT access tokens issued by get_token',
+)
+SIGNUPS = Counter(
+    'yamdb_signups_total',
+    'Signups by kind (new user or repeated signup)',
+    ('kind',),
+)
+MEMORY = Gauge(
+    'yamdb_process_resident_memory_bytes',
+    'Resident memory of the API worker processes',
+    multiprocess_mode='livesum',
+)
+
+MEMORY_INTERVAL = 10
+memory_updated = 0.0
+
+
+def resident_memory():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # Вне Linux доступен только пик: ru_maxrss в килобайтах.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def update_memory():
+    """Обновляет метрику памяти не чаще раза в MEMORY_INTERVAL секунд."""
+    global memory_updated
+    now = time.monotonic()
+    if now - memory_updated >= MEMORY_INTERVAL:
+        memory_updated = now
+        MEMORY.set(resident_memory())
+
+
+class OutboxCollector:
+    """Глубина очереди писем по статусам; считается при каждом scrape."""
+
+    def collect(self):
+        from django.db.models import Count
+
+        from users.models import EmailJob
+
+        depth = GaugeMetricFamily(
+            'yamdb_email_outbox_jobs',
+            'Email outbox jobs by status',
+            labels=('status',),
+        )
+        counts = dict(
+            EmailJob.objects.order_by().values_list('status').annotate(
+                total=Count('pk')
+            )
+        )
+        for status, _ in EmailJob.STATUSES:
+            depth.add_metric((status,), counts.get(status, 0))
+        yield depth
+
+
+outbox_registry = CollectorRegistry(auto_describe=False)
+outbox_registry.register(OutboxCollector())
+
+
+def exposition():
+    """Текст метрик в формате Prometheus и его Content-Type."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    update_memory()
+    output = generate_latest(registry) + generate_latest(outbox_registry)
+    return output, CONTENT_TYPE_LATEST
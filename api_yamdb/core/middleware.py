@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from core import db, metrics, profiling
+
+logger = logging.getLogger('core.profiling')
+
+
+class RequestProfilingMiddleware:
+    """Профилирует выборку запросов: число и время SQL-запросов, самые
+    медленные из них, время сериализации и общее время.
+
+    Результат отдаётся заголовком ``Server-Timing``, строкой JSON в лог
+    ``core.profiling`` и копится в гистограммах по маршрутам
+    (``/api/v1/profiling/stats/``). Включается ``REQUEST_PROFILING``,
+    доля профилируемых запросов — ``REQUEST_PROFILING_SAMPLE_RATE``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        self.slow_queries = settings.REQUEST_PROFILING_SLOW_QUERIES
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        profile = profiling.Profile(self.slow_queries)
+        profiling.local.profile = profile
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            profiling.local.profile = None
+        total_time = profile.total_time
+        route = self.route(request)
+        profiling.stats.record(
+            route, response.status_code, profile, total_time
+        )
+        response['Server-Timing'] = ', '.join((
+            'db;dur=%.2f;desc="%s queries"' % (
+                profile.sql_time * 1000, profile.queries
+            ),
+            'serialize;dur=%.2f' % (profile.serializer_time * 1000),
+            'total;dur=%.2f' % (total_time * 1000),
+        ))
+        logger.info(json.dumps({
+            'route': route,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_time * 1000, 2),
+            'sql_ms': round(profile.sql_time * 1000, 2),
+            'serializer_ms': round(profile.serializer_time * 1000, 2),
+            'queries': profile.queries,
+            'slowest_queries': profile.slowest_queries(),
+        }, ensure_ascii=False))
+        return response
+
+    @staticmethod
+    def route(request):
+        return f'{request.method} {route_name(request)}'
+
+
+def route_name(request):
+    """Имя маршрута для меток и статистики; нераспознанные пути
+    сводятся к одному значению, чтобы не плодить метки.
+    """
+    match = getattr(request, 'resolver_match', None)
+    return match.url_name if match and match.url_name else 'unresolved'
+
+
+class QueryCounter:
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Считает запросы, время ответа и число SQL-запросов по маршрутам
+    для ``/metrics``. Включается ``METRICS_ENABLED``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        route = route_name(request)
+        metrics.REQUESTS.labels(
+            route, request.method, response.status_code
+        ).inc()
+        metrics.LATENCY.labels(route, request.method).observe(
+            time.perf_counter() - started
+        )
+        metrics.DB_QUERIES.labels(route).observe(counter.queries)
+        metrics.update_memory()
+        return response
+
+
+class ReplicaMiddleware:
+    """Направляет чтения безопасных запросов (GET, HEAD, OPTIONS) к
+    вьюсетам с ``read_from_replicas = True`` на реплики из ``DB_REPLICAS``
+    по кругу: одна реплика на весь запрос.
+
+    После успешного изменяющего запроса клиент на
+    ``DB_REPLICA_PIN_SECONDS`` закрепляется за основной БД, чтобы сразу
+    видеть свои изменения. Закрепление хранится в подписанной cookie,
+    поэтому действует в любом воркере, и дублируется в кэше по
+    заголовку ``Authorization`` (без него — по IP) для клиентов без
+    cookie: между воркерами так оно работает только с общим кэшем.
+    Без реплик middleware отключается.
+    """
+
+    pin_cookie = 'replica_pin'
+
+    def __init__(self, get_response):
+        aliases = db.replica_aliases()
+        if not aliases:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pool = db.ReplicaPool(aliases)
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            db.local.replica = None
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self.pin(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            request.method in SAFE_METHODS
+            and getattr(view_class, 'read_from_replicas', False)
+            and not self.is_pinned(request)
+        ):
+            db.local.replica = self.pool.next()
+
+    def pin(self, request, response):
+        seconds = settings.DB_REPLICA_PIN_SECONDS
+        cache.set(self.pin_key(request), True, seconds)
+        response.set_signed_cookie(
+            self.pin_cookie,
+            '1',
+            salt=self.pin_cookie,
+            max_age=math.ceil(seconds),
+            httponly=True,
+        )
+
+    def is_pinned(self, request):
+        # Возраст подписи проверяется на сервере: cookie не продлить.
+        return bool(request.get_signed_cookie(
+            self.pin_cookie,
+            default=None,
+            salt=self.pin_cookie,
+            max_age=settings.DB_REPLICA_PIN_SECONDS,
+        )) or bool(cache.get(self.pin_key(request)))
+
+    @staticmethod
+    def pin_key(request):
+        client = request.META.get('HTTP_AUTHORIZATION') or request.META.get(
+            'REMOTE_ADDR', ''
+        )
+        return 'replica:pin:%s' % hashlib.md5(client.encode()).hexdigest()
@@ -0,0 +1,157 @@
+import bisect
+import heapq
+import threading
+import time
+
+# Верхние границы корзин гистограммы времени ответа, мс.
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+local = threading.local()
+
+
+class Profile:
+    """Замеры одного запроса: SQL, сериализация и общее время."""
+
+    def __init__(self, slow_queries=3):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.slow_queries = slow_queries
+        self.slowest = []
+
+    def add_query(self, sql, duration):
+        self.queries += 1
+        self.sql_time += duration
+        if self.slow_queries:
+            entry = (duration, self.queries, sql[:200])
+            if len(self.slowest) < self.slow_queries:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add_query(sql, time.perf_counter() - started)
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def slowest_queries(self):
+        return [
+            {'sql': sql, 'ms': round(duration * 1000, 2)}
+            for duration, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+def current_profile():
+    return getattr(local, 'profile', None)
+
+
+class RouteStats:
+    """Гистограммы времени ответа и счётчики SQL по маршрутам
+    в текущем процессе.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, status_code, profile, total_time):
+        total_ms = total_time * 1000
+        bucket = bisect.bisect_left(BUCKETS, total_ms)
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    'count': 0,
+                    'errors': 0,
+                    'total_ms': 0.0,
+                    'sql_ms': 0.0,
+                    'serializer_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'buckets': [0] * len(BUCKETS),
+                }
+            stats['count'] += 1
+            stats['errors'] += status_code >= 500
+            stats['total_ms'] += total_ms
+            stats['sql_ms'] += profile.sql_time * 1000
+            stats['serializer_ms'] += profile.serializer_time * 1000
+            stats['queries'] += profile.queries
+            stats['max_queries'] = max(stats['max_queries'], profile.queries)
+            stats['buckets'][bucket] += 1
+
+    def as_dict(self):
+        with self.lock:
+            routes = {
+                route: dict(stats, buckets=list(stats['buckets']))
+                for route, stats in self.routes.items()
+            }
+        for stats in routes.values():
+            count = stats['count']
+            for key in ('total_ms', 'sql_ms', 'serializer_ms', 'queries'):
+                stats[f'mean_{key}'] = round(stats.pop(key) / count, 2)
+            stats['p50_ms'] = percentile(stats['buckets'], count, 0.5)
+            stats['p95_ms'] = percentile(stats['buckets'], count, 0.95)
+            stats['buckets'] = {
+                str(bound): hits
+                for bound, hits in zip(BUCKETS, stats['buckets'])
+            }
+        return routes
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+def percentile(buckets, count, fraction):
+    """Верхняя граница корзины, в которую попадает перцентиль."""
+    seen = 0
+    for bound, hits in zip(BUCKETS, buckets):
+        seen += hits
+        if seen >= count * fraction:
+            return bound if bound != float('inf') else None
+    return None
+
+
+stats = RouteStats()
+
+
+class TimedSerializer:
+    """Обёртка сериализатора: время ``data`` добавляется в профиль
+    запроса, остальные атрибуты берутся у сериализатора.
+    """
+
+    def __init__(self, serializer, profile):
+        self.serializer = serializer
+        self.profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self.serializer, name)
+
+    @property
+    def data(self):
+        started = time.perf_counter()
+        try:
+            return self.serializer.data
+        finally:
+            self.profile.serializer_time += time.perf_counter() - started
+
+
+class ProfiledSerializerMixin:
+    """Засекает время сериализации ответа вьюсета в профилируемых
+    запросах. Вложенные сериализаторы вызывают ``to_representation``
+    напрямую, поэтому в замер попадает вся сериализация ответа.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        profile = current_profile()
+        if profile is None:
+            return serializer
+        return TimedSerializer(serializer, profile)
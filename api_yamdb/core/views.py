@@ -0,0 +1,11 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from core import metrics as prometheus
+
+
+def metrics(request):
+    if not getattr(settings, 'METRICS_ENABLED', False):
+        raise Http404
+    output, content_type = prometheus.exposition()
+    return HttpResponse(output, content_type=content_type)
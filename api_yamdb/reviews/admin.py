@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from reviews.models import Comment, Review
+from reviews.models import Comment, Review, TitleStats
 
 
 class ReviewAdmin(admin.ModelAdmin):
@@ -20,5 +20,11 @@ class CommentAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class TitleStatsAdmin(admin.ModelAdmin):
+    list_display = ('title', 'review_count', 'last_review_at',)
+    readonly_fields = [field.name for field in TitleStats._meta.fields]
+
+
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Review, ReviewAdmin)
+admin.site.register(TitleStats, TitleStatsAdmin)
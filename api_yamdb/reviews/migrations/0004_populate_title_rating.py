@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def populate_title_rating(apps, schema_editor):
+    from django.db.models import Count, Sum
+
+    Title = apps.get_model('categories', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    totals = Review.objects.order_by().values('title_id').annotate(
+        score_sum=Sum('score'), score_count=Count('pk')
+    )
+    for row in totals.iterator():
+        Title.objects.filter(pk=row['title_id']).update(
+            rating_sum=row['score_sum'],
+            rating_count=row['score_count'],
+            rating=row['score_sum'] / row['score_count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0005_title_rating'),
+        ('reviews', '0003_auto_20220731_1350'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_title_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def populate_title_stats(apps, schema_editor):
+    from django.db.models import Count, Max, Q
+
+    Title = apps.get_model('categories', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    totals = Review.objects.order_by().values('title_id').annotate(
+        review_count=Count('pk'),
+        last_review_at=Max('pub_date'),
+        **{
+            f'score_{score}': Count('pk', filter=Q(score=score))
+            for score in range(1, 11)
+        },
+    )
+    rows = {row.pop('title_id'): row for row in totals.iterator()}
+    TitleStats.objects.bulk_create(
+        TitleStats(title_id=pk, **rows.get(pk, {}))
+        for pk in Title.objects.values_list('pk', flat=True).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_title_stats, migrations.RunPython.noop),
+    ]
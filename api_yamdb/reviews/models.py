@@ -1,10 +1,20 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from categories.models import Title
 from users.models import User
 
 
+def touch_updated_at(save_kwargs):
+    """Добавляет ``updated_at`` в ``update_fields``: по нему строятся
+    ETag и Last-Modified (см. ``api.conditional``).
+    """
+    if save_kwargs.get('update_fields') is not None:
+        save_kwargs['update_fields'] = {
+            *save_kwargs['update_fields'], 'updated_at'
+        }
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -33,11 +43,21 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date'),
+                name='review_title_pub_date_idx',
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=('title', 'author',),
@@ -45,6 +65,19 @@ class Review(models.Model):
             ),
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        touch_updated_at(kwargs)
+        # Рейтинг произведения обновляется в post_save в той же транзакции.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self._loaded_score = self.score
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -67,8 +100,74 @@ class Comment(models.Model):
         auto_now_add=True,
         db_index=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        touch_updated_at(kwargs)
+        super().save(*args, **kwargs)
+
+
+SCORES = range(1, 11)
+
+
+class TitleStats(models.Model):
+    """Статистика отзывов произведения: гистограмма оценок, количество
+    отзывов и время последнего. Обновляется сигналами из
+    ``reviews.signals`` и пересобирается командой ``rebuild_title_stats``.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+    )
+    last_review_at = models.DateTimeField(
+        verbose_name='Последний отзыв',
+        null=True,
+        blank=True,
+    )
+    score_1 = models.PositiveIntegerField(verbose_name='Оценок 1', default=0)
+    score_2 = models.PositiveIntegerField(verbose_name='Оценок 2', default=0)
+    score_3 = models.PositiveIntegerField(verbose_name='Оценок 3', default=0)
+    score_4 = models.PositiveIntegerField(verbose_name='Оценок 4', default=0)
+    score_5 = models.PositiveIntegerField(verbose_name='Оценок 5', default=0)
+    score_6 = models.PositiveIntegerField(verbose_name='Оценок 6', default=0)
+    score_7 = models.PositiveIntegerField(verbose_name='Оценок 7', default=0)
+    score_8 = models.PositiveIntegerField(verbose_name='Оценок 8', default=0)
+    score_9 = models.PositiveIntegerField(verbose_name='Оценок 9', default=0)
+    score_10 = models.PositiveIntegerField(
+        verbose_name='Оценок 10', default=0
+    )
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    @property
+    def histogram(self):
+        return {
+            str(score): getattr(self, f'score_{score}') for score in SCORES
+        }
+
+    def __str__(self):
+        return f'{self.title_id}: {self.review_count}'
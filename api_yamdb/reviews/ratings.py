@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, FloatField, IntegerField, OuterRef, Q,
+    Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce
+
+from categories.models import Title
+from reviews.models import Review
+
+
+def weighted_mean(score_sum, score_count):
+    """Взвешенный (байесовский) рейтинг — (сумма + m·C) / (количество + m),
+    где C и m берутся из RATING_PRIOR_MEAN и RATING_PRIOR_WEIGHT.
+
+    Только арифметика, поэтому годится и для выражений ORM, и для
+    столбцов pandas (см. ``export_analytics``).
+    """
+    prior_mean = settings.RATING_PRIOR_MEAN
+    prior_weight = settings.RATING_PRIOR_WEIGHT
+    return (
+        (score_sum + prior_weight * prior_mean)
+        / (score_count + prior_weight)
+    )
+
+
+def mean_score(score_sum, score_count, empty, weighted=False):
+    """Средняя оценка для UPDATE; ``empty`` — условие «отзывов нет».
+
+    С ``weighted`` — взвешенный рейтинг (``weighted_mean``); без отзывов
+    он равен RATING_PRIOR_MEAN, а средняя оценка — None.
+    """
+    score_sum = Cast(score_sum, FloatField())
+    score_count = Cast(score_count, FloatField())
+    if weighted:
+        prior_mean = settings.RATING_PRIOR_MEAN
+        score = weighted_mean(score_sum, score_count)
+    else:
+        prior_mean = None
+        score = score_sum / score_count
+    return Case(
+        When(empty, then=Value(prior_mean)),
+        default=ExpressionWrapper(score, output_field=FloatField()),
+        output_field=FloatField(),
+    )
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """Сдвигает сохранённые сумму и количество оценок произведения
+    одним UPDATE и пересчитывает средний и взвешенный рейтинг.
+    """
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    empty = Q(rating_count=-count_delta)
+    rating = mean_score(new_sum, new_count, empty)
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=rating,
+        rating_sort=Coalesce(rating, 0.0),
+        weighted_rating=mean_score(new_sum, new_count, empty, weighted=True),
+    )
+
+
+def rebuild_title_ratings(queryset=None):
+    """Пересчитывает рейтинг произведений с нуля по таблице отзывов."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    score_sum = Subquery(
+        reviews.annotate(total=Sum('score')).values('total'),
+        output_field=IntegerField(),
+    )
+    score_count = Subquery(
+        reviews.annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField(),
+    )
+    updated = queryset.update(
+        rating_sum=Coalesce(score_sum, 0),
+        rating_count=Coalesce(score_count, 0),
+    )
+    score_sum, score_count = F('rating_sum'), F('rating_count')
+    empty = Q(rating_count=0)
+    rating = mean_score(score_sum, score_count, empty)
+    queryset.update(
+        rating=rating,
+        rating_sort=Coalesce(rating, 0.0),
+        weighted_rating=mean_score(
+            score_sum, score_count, empty, weighted=True
+        ),
+    )
+    return updated
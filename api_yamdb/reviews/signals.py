@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.models import Title
+from reviews.models import Review, TitleStats
+from reviews.ratings import rebuild_title_ratings, update_title_rating
+from reviews.stats import rebuild_title_stats, update_title_stats
+
+
+@receiver(post_save, sender=Title)
+def create_title_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        TitleStats.objects.get_or_create(title=instance)
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, created, **kwargs):
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+        update_title_stats(
+            instance.title_id, {instance.score: 1}, 1, instance.pub_date
+        )
+        return
+    old_score = getattr(instance, '_loaded_score', None)
+    if old_score is None:
+        # Старая оценка неизвестна (отзыв загружен без поля score).
+        titles = Title.objects.filter(pk=instance.title_id)
+        rebuild_title_ratings(titles)
+        rebuild_title_stats(titles)
+    elif old_score != instance.score:
+        update_title_rating(instance.title_id, instance.score - old_score, 0)
+        update_title_stats(
+            instance.title_id, {old_score: -1, instance.score: 1}
+        )
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    update_title_rating(instance.title_id, -instance.score, -1)
+    update_title_stats(instance.title_id, {instance.score: -1}, -1)
@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import (
+    Case, Count, F, Max, Q, Subquery, Value, When,
+)
+
+from categories.models import Title
+from reviews.models import SCORES, Review, TitleStats
+
+
+def score_field(score):
+    return f'score_{score}'
+
+
+def update_title_stats(title_id, scores, review_delta=0, pub_date=None):
+    """Сдвигает счётчики статистики произведения одним UPDATE.
+
+    ``scores`` — словарь {оценка: приращение}. ``pub_date`` — время
+    добавленного отзыва; при удалении отзыва время последнего берётся
+    заново по индексу (title_id, pub_date). Если строки статистики ещё
+    нет (произведение загружено в обход сигналов), она пересобирается;
+    при удалении отзыва — нет: строка могла быть удалена вместе
+    с произведением.
+    """
+    values = {
+        score_field(score): F(score_field(score)) + delta
+        for score, delta in scores.items()
+        if delta
+    }
+    if review_delta:
+        values['review_count'] = F('review_count') + review_delta
+    if pub_date is not None:
+        values['last_review_at'] = Case(
+            When(
+                Q(last_review_at__isnull=True)
+                | Q(last_review_at__lt=pub_date),
+                then=Value(pub_date),
+            ),
+            default=F('last_review_at'),
+        )
+    elif review_delta < 0:
+        values['last_review_at'] = Subquery(
+            Review.objects.filter(title_id=title_id).order_by(
+                '-pub_date'
+            ).values('pub_date')[:1]
+        )
+    if not values:
+        return
+    updated = TitleStats.objects.filter(pk=title_id).update(**values)
+    if not updated and review_delta >= 0:
+        rebuild_title_stats(Title.objects.filter(pk=title_id))
+
+
+def rebuild_title_stats(queryset=None):
+    """Пересчитывает статистику произведений с нуля по таблице отзывов:
+    один агрегирующий запрос и пакетная вставка.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    title_ids = queryset.values('pk')
+    totals = Review.objects.filter(title__in=title_ids).order_by().values(
+        'title_id'
+    ).annotate(
+        review_count=Count('pk'),
+        last_review_at=Max('pub_date'),
+        **{
+            score_field(score): Count('pk', filter=Q(score=score))
+            for score in SCORES
+        },
+    )
+    rows = {row.pop('title_id'): row for row in totals.iterator()}
+    with transaction.atomic():
+        TitleStats.objects.filter(title__in=title_ids).delete()
+        created = TitleStats.objects.bulk_create(
+            TitleStats(title_id=pk, **rows.get(pk, {}))
+            for pk in queryset.values_list('pk', flat=True).iterator()
+        )
+    return len(created)
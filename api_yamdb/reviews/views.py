@@ -1,35 +1,130 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets
+from django.utils.functional import cached_property
+from rest_framework import permissions, viewsets
 
+from api.cache import version_key
+from api.conditional import ConditionalGetMixin
+from api.fieldsets import SparseFieldsetMixin
+from api.filters import FullTextSearchFilter
+from api.pagination import PageNumberOrKeysetPagination
 from api.serializers import ReviewSerializer, CommentSerializer
 from api.permissions import IsAdminModeratorOrReadOnly
-from reviews.models import Review
+from reviews.models import Comment, Review
 from categories.models import Title
+from core.profiling import ProfiledSerializerMixin
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class AuthorObjectMixin:
+    """Изменение и удаление отзыва или комментария с одним запросом на
+    поиск объекта.
+
+    Объект ищется по id и вложенным id из URL с теми же фильтрами, что и
+    в ``get_object`` DRF. Модератор и администратор получают объект
+    вместе с автором. Для остальных в тот же запрос добавляется
+    ``author_id``: чужой объект не загружается, а его существование
+    проверяется отдельно, только чтобы ответить 403, а не 404.
+    """
+
+    def get_object(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return super().get_object()
+        user = self.request.user
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup = {self.lookup_field: self.kwargs[self.lookup_field]}
+        privileged = user.is_admin or user.is_moderator
+        if privileged:
+            found = queryset.select_related('author')
+        else:
+            found = queryset.select_related(None).filter(author_id=user.pk)
+        obj = found.filter(**lookup).first()
+        if obj is None:
+            if privileged or not queryset.filter(**lookup).exists():
+                raise Http404
+            self.permission_denied(self.request)
+        if not privileged:
+            # Автор уже загружен аутентификацией.
+            obj.author = user
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class ReviewViewSet(
+    AuthorObjectMixin, SparseFieldsetMixin, ConditionalGetMixin,
+    ProfiledSerializerMixin, viewsets.ModelViewSet,
+):
+    read_from_replicas = True
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminModeratorOrReadOnly,)
+    pagination_class = PageNumberOrKeysetPagination
+    filter_backends = (FullTextSearchFilter,)
+    search_fields = ('text',)
+    conditional_date_field = 'updated_at'
+    sparse_model_fields = ('pub_date', 'updated_at')
+
+    def version_keys(self):
+        return [version_key('reviews', self.kwargs.get('title_id'))]
+
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        queryset = Review.objects.filter(title_id=self.kwargs.get('title_id'))
+        if self.wants('author'):
+            queryset = queryset.select_related('author')
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            # Пустая страница: 404, если произведения не существует.
+            self.title
+        return page
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    AuthorObjectMixin, SparseFieldsetMixin, ConditionalGetMixin,
+    ProfiledSerializerMixin, viewsets.ModelViewSet,
+):
+    read_from_replicas = True
     serializer_class = CommentSerializer
     permission_classes = (IsAdminModeratorOrReadOnly,)
+    pagination_class = PageNumberOrKeysetPagination
+    filter_backends = (FullTextSearchFilter,)
+    search_fields = ('text',)
+    conditional_date_field = 'updated_at'
+    sparse_model_fields = ('pub_date', 'updated_at')
+
+    def version_keys(self):
+        return [version_key('comments', self.kwargs.get('review_id'))]
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review,
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
 
     def get_queryset(self):
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        queryset = Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        )
+        if self.wants('author'):
+            queryset = queryset.select_related('author')
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            # Пустая страница: 404, если отзыва у произведения нет.
+            self.review
+        return page
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
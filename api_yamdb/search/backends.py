@@ -0,0 +1,257 @@
+import re
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+MAX_TERMS = 16
+
+
+def parse_terms(query):
+    """Слова запроса без операторов FTS; не больше ``MAX_TERMS``."""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+class BaseSearchBackend(ABC):
+    """Интерфейс бэкенда полнотекстового поиска.
+
+    Последнее слово запроса ищется по префиксу (поиск по мере ввода),
+    остальные — целиком; все слова должны встретиться в документе.
+    ``filter`` возвращает queryset, отфильтрованный подзапросом к
+    индексу и упорядоченный по аннотации ``search_rank``
+    (больше — релевантнее).
+    """
+
+    vendor = None
+
+    @abstractmethod
+    def create_schema(self, schema_editor, documents):
+        pass
+
+    @abstractmethod
+    def index(self, document, instance):
+        pass
+
+    @abstractmethod
+    def remove(self, document, pk):
+        pass
+
+    @abstractmethod
+    def rebuild(self, document):
+        pass
+
+    @abstractmethod
+    def filter(self, queryset, document, query, fields=None):
+        pass
+
+    @staticmethod
+    def outer_pk(document):
+        return '{}.{}'.format(
+            connection.ops.quote_name(document.model._meta.db_table),
+            connection.ops.quote_name(document.model._meta.pk.column),
+        )
+
+    def ranked(self, queryset, document, match_sql, rank_sql, params):
+        # extra(), а не pk__in=RawSQL(...): RawSQL оборачивается в скобки
+        # второй раз, и IN ((SELECT ...)) сравнивает только с первой строкой.
+        return queryset.extra(
+            where=[f'{self.outer_pk(document)} IN ({match_sql})'],
+            params=params,
+        ).annotate(
+            search_rank=RawSQL(rank_sql, params, output_field=FloatField())
+        ).order_by('-search_rank', 'pk')
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """Индекс на виртуальных таблицах SQLite FTS5, rowid = pk объекта."""
+
+    vendor = 'sqlite'
+    tokenizer = 'unicode61 remove_diacritics 2'
+
+    def create_schema(self, schema_editor, documents):
+        for document in documents:
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS {} USING fts5({}, '
+                "tokenize='{}')".format(
+                    document.table,
+                    ', '.join(document.field_names),
+                    self.tokenizer,
+                )
+            )
+
+    def index(self, document, instance):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {document.table} WHERE rowid = %s',
+                [instance.pk],
+            )
+            cursor.execute(
+                'INSERT INTO {}(rowid, {}) VALUES (%s, {})'.format(
+                    document.table,
+                    ', '.join(document.field_names),
+                    ', '.join(['%s'] * len(document.fields)),
+                ),
+                [instance.pk, *document.values(instance)],
+            )
+
+    def remove(self, document, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {document.table} WHERE rowid = %s', [pk]
+            )
+
+    def rebuild(self, document):
+        meta = document.model._meta
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {document.table}')
+            cursor.execute(
+                'INSERT INTO {table}(rowid, {fields}) '
+                'SELECT {pk}, {values} FROM {source}'.format(
+                    table=document.table,
+                    fields=', '.join(document.field_names),
+                    pk=meta.pk.column,
+                    values=', '.join(
+                        f"COALESCE({meta.get_field(field).column}, '')"
+                        for field in document.fields
+                    ),
+                    source=meta.db_table,
+                )
+            )
+
+    @staticmethod
+    def match_expression(terms, fields):
+        phrases = [f'"{term}"' for term in terms]
+        phrases[-1] += '*'
+        expression = ' '.join(phrases)
+        if fields:
+            expression = '{{{}}} : ({})'.format(' '.join(fields), expression)
+        return expression
+
+    def filter(self, queryset, document, query, fields=None):
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        table = document.table
+        return self.ranked(
+            queryset,
+            document,
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s',
+            f'SELECT -bm25({table}) FROM {table} '
+            f'WHERE {table} MATCH %s AND rowid = {self.outer_pk(document)}',
+            [self.match_expression(terms, fields)],
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Индекс в таблицах с колонкой tsvector и GIN-индексом."""
+
+    vendor = 'postgresql'
+
+    @property
+    def config(self):
+        return getattr(settings, 'SEARCH_POSTGRES_CONFIG', 'simple')
+
+    def create_schema(self, schema_editor, documents):
+        for document in documents:
+            schema_editor.execute(
+                f'CREATE TABLE IF NOT EXISTS {document.table} ('
+                'object_id integer PRIMARY KEY, document tsvector NOT NULL)'
+            )
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {document.table}_document_idx '
+                f'ON {document.table} USING GIN (document)'
+            )
+
+    def vector_sql(self, document, columns):
+        return ' || '.join(
+            f"setweight(to_tsvector('{self.config}', "
+            f"COALESCE({column}, '')), '{weight}')"
+            for column, weight in zip(columns, document.fields.values())
+        )
+
+    def index(self, document, instance):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table}(object_id, document) '
+                'VALUES (%s, {vector}) '
+                'ON CONFLICT (object_id) DO UPDATE '
+                'SET document = EXCLUDED.document'.format(
+                    table=document.table,
+                    vector=self.vector_sql(
+                        document, ['%s::text'] * len(document.fields)
+                    ),
+                ),
+                [instance.pk, *document.values(instance)],
+            )
+
+    def remove(self, document, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {document.table} WHERE object_id = %s', [pk]
+            )
+
+    def rebuild(self, document):
+        meta = document.model._meta
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {document.table}')
+            cursor.execute(
+                'INSERT INTO {table}(object_id, document) '
+                'SELECT {pk}, {vector} FROM {source}'.format(
+                    table=document.table,
+                    pk=meta.pk.column,
+                    vector=self.vector_sql(document, [
+                        meta.get_field(field).column
+                        for field in document.fields
+                    ]),
+                    source=meta.db_table,
+                )
+            )
+
+    @staticmethod
+    def tsquery(document, terms, fields):
+        weights = ''.join(
+            document.fields[field] for field in fields or ()
+        )
+        lexemes = [f"'{term}'{':' + weights if weights else ''}"
+                   for term in terms]
+        lexemes[-1] = f"'{terms[-1]}':*{weights}"
+        return ' & '.join(lexemes)
+
+    def filter(self, queryset, document, query, fields=None):
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        table = document.table
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        return self.ranked(
+            queryset,
+            document,
+            f'SELECT object_id FROM {table} WHERE document @@ {tsquery}',
+            f'SELECT ts_rank(document, {tsquery}) FROM {table} '
+            f'WHERE object_id = {self.outer_pk(document)}',
+            [self.tsquery(document, terms, fields)],
+        )
+
+
+BACKENDS = {
+    backend.vendor: backend
+    for backend in (SQLiteSearchBackend, PostgresSearchBackend)
+}
+
+
+def get_backend(vendor=None):
+    """Бэкенд из ``settings.SEARCH_BACKEND`` или по типу БД.
+
+    Возвращает None, если для БД нет полнотекстового бэкенда или поиск
+    отключён (``SEARCH_BACKEND = ''``); тогда используется icontains.
+    """
+    path = getattr(settings, 'SEARCH_BACKEND', None)
+    if path == '':
+        return None
+    if path:
+        return import_string(path)()
+    backend = BACKENDS.get(vendor or connection.vendor)
+    return backend() if backend else None
@@ -0,0 +1,38 @@
+from categories.models import Title
+from reviews.models import Comment, Review
+
+
+class Document:
+    """Описание индексируемой модели: таблица индекса и поля с весами
+    (вес учитывается бэкендом PostgreSQL).
+    """
+
+    def __init__(self, kind, model, fields):
+        self.kind = kind
+        self.model = model
+        self.fields = fields
+        self.table = f'search_{kind}'
+
+    @property
+    def field_names(self):
+        return tuple(self.fields)
+
+    def values(self, instance):
+        return [getattr(instance, field) or '' for field in self.fields]
+
+
+DOCUMENTS = {
+    document.kind: document
+    for document in (
+        Document('titles', Title, {'name': 'A', 'description': 'B'}),
+        Document('reviews', Review, {'text': 'A'}),
+        Document('comments', Comment, {'text': 'A'}),
+    )
+}
+
+
+def get_document(model):
+    for document in DOCUMENTS.values():
+        if document.model is model:
+            return document
+    return None
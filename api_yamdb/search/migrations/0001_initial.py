@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from search.backends import get_backend
+    from search.documents import DOCUMENTS
+
+    backend = get_backend(schema_editor.connection.vendor)
+    if backend is None:
+        return
+    backend.create_schema(schema_editor, DOCUMENTS.values())
+    for document in DOCUMENTS.values():
+        backend.rebuild(document)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('categories', '0005_title_rating'),
+        ('reviews', '0004_populate_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, migrations.RunPython.noop),
+    ]
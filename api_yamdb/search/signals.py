@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.models import Title
+from reviews.models import Comment, Review
+from search.backends import get_backend
+from search.documents import get_document
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def index_instance(sender, instance, update_fields=None, **kwargs):
+    backend = get_backend()
+    document = get_document(sender)
+    if backend is None or (
+        # Сохранены только неиндексируемые поля.
+        update_fields is not None
+        and not document.fields.keys() & update_fields
+    ):
+        return
+    backend.index(document, instance)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def remove_instance(sender, instance, **kwargs):
+    backend = get_backend()
+    if backend is not None:
+        backend.remove(get_document(sender), instance.pk)
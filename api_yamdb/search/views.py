@@ -0,0 +1,87 @@
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework import exceptions, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.serializers import (
+    SearchCommentSerializer,
+    SearchReviewSerializer,
+    TitleSerializer,
+)
+from categories.models import Title
+from reviews.models import Comment, Review
+from search.backends import get_backend, parse_terms
+from search.documents import DOCUMENTS
+
+
+class SearchView(APIView):
+    """Поиск по произведениям, отзывам и комментариям.
+
+    ``?q=`` — запрос, ``?type=titles,reviews`` — где искать (по умолчанию
+    везде), ``?limit=`` — сколько результатов каждого типа вернуть.
+    """
+
+    permission_classes = (permissions.AllowAny,)
+    default_limit = 10
+    max_limit = 50
+    serializers = {
+        'titles': TitleSerializer,
+        'reviews': SearchReviewSerializer,
+        'comments': SearchCommentSerializer,
+    }
+
+    @staticmethod
+    def get_queryset(kind):
+        return {
+            'titles': lambda: Title.objects.select_related(
+                'category'
+            ).prefetch_related('genre'),
+            'reviews': lambda: Review.objects.select_related('author'),
+            'comments': lambda: Comment.objects.select_related(
+                'author', 'review'
+            ),
+        }[kind]()
+
+    def get_kinds(self, request):
+        value = request.query_params.get('type')
+        if not value:
+            return list(DOCUMENTS)
+        kinds = value.split(',')
+        unknown = set(kinds) - set(DOCUMENTS)
+        if unknown:
+            raise exceptions.ValidationError(
+                {'type': f'Неизвестный тип: {", ".join(sorted(unknown))}'}
+            )
+        return kinds
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise exceptions.ValidationError({'limit': 'Ожидается число'})
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        if not parse_terms(query):
+            raise exceptions.ValidationError({'q': 'Пустой поисковый запрос'})
+        limit = self.get_limit(request)
+        backend = get_backend()
+        data = {}
+        for kind in self.get_kinds(request):
+            document = DOCUMENTS[kind]
+            queryset = self.get_queryset(kind)
+            if backend is None:
+                queryset = queryset.filter(reduce(or_, (
+                    Q(**{f'{field}__icontains': query})
+                    for field in document.fields
+                )))
+            else:
+                queryset = backend.filter(queryset, document, query)
+            data[kind] = self.serializers[kind](
+                queryset[:limit], many=True, context={'request': request}
+            ).data
+        return Response(data, status=status.HTTP_200_OK)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import EmailJob, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -10,4 +10,15 @@ class UserAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class EmailJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'to', 'subject', 'status', 'attempts', 'next_attempt_at',
+        'sent_at',
+    )
+    search_fields = ('to',)
+    list_filter = ('status',)
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(EmailJob, EmailJobAdmin)
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.caches import is_shared
+from .models import User
+
+
+class VerifiedTokens:
+    """LRU уже проверенных токенов текущего процесса: подпись горячего
+    токена проверяется один раз, дальше — только срок действия.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+
+    def get(self, raw_token):
+        with self.lock:
+            token = self.tokens.get(raw_token)
+            if token is not None:
+                self.tokens.move_to_end(raw_token)
+        if token is not None and token['exp'] > time.time():
+            return token
+        return None
+
+    def add(self, raw_token, token):
+        with self.lock:
+            self.tokens[raw_token] = token
+            self.tokens.move_to_end(raw_token)
+            while len(self.tokens) > settings.JWT_VERIFIED_TOKENS:
+                self.tokens.popitem(last=False)
+
+
+verified_tokens = VerifiedTokens()
+
+
+def token_version_key(user_id):
+    return f'auth:token_version:{user_id}'
+
+
+def token_version(user_id):
+    """Текущая версия токенов пользователя; -1, если его нет.
+
+    Версия кэшируется в кэше ``default`` и сбрасывается сигналами из
+    ``users.signals`` при изменении или удалении пользователя. С общим
+    для процессов кэшем она живёт ``JWT_TOKEN_VERSION_TIMEOUT`` секунд;
+    с locmem сброс виден только одному воркеру, поэтому версия живёт
+    ``JWT_TOKEN_VERSION_LOCAL_TIMEOUT`` секунд — на столько остальные
+    воркеры могут опоздать с отзывом.
+    """
+    if is_shared(caches['default']):
+        timeout = settings.JWT_TOKEN_VERSION_TIMEOUT
+    else:
+        timeout = settings.JWT_TOKEN_VERSION_LOCAL_TIMEOUT
+    if timeout <= 0:
+        return load_token_version(user_id)
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = load_token_version(user_id)
+        cache.set(key, version, timeout)
+    return version
+
+
+def load_token_version(user_id):
+    # Только основная БД: реплика могла ещё не получить отзыв.
+    version = User.objects.using('default').filter(
+        pk=user_id
+    ).values_list('token_version', flat=True).order_by().first()
+    return -1 if version is None else version
+
+
+def access_token_for(user):
+    """Токен доступа с ролью и правами пользователя в claims."""
+    token = AccessToken.for_user(user)
+    token['token_version'] = user.token_version
+    for claim, value in user.token_claims().items():
+        token[claim] = value
+    return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без запроса к таблице пользователей.
+
+    Для токенов из ``access_token_for`` пользователь собирается из claims:
+    ``request.user`` — экземпляр ``User`` с загруженными ``token_fields``,
+    остальные поля отложены и догружаются одним запросом при первом
+    обращении. Токен действителен, пока его ``token_version`` совпадает
+    с версией пользователя. Токены без claims обрабатываются как в
+    ``JWTAuthentication``.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = verified_tokens.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            verified_tokens.add(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        if 'token_version' not in validated_token:
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version = validated_token['token_version']
+        if version != token_version(user_id):
+            raise AuthenticationFailed(
+                _('Token has been revoked'), code='token_revoked'
+            )
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        claims = dict(
+            {
+                claim: validated_token[claim]
+                for claim in User.token_fields
+            },
+            token_version=version,
+            **{api_settings.USER_ID_FIELD: user_id},
+        )
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return User.from_db(
+            'default', field_names, [claims[name] for name in field_names]
+        )
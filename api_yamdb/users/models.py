@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from api_yamdb.settings import ADMIN, MODERATOR, USER
@@ -23,8 +24,44 @@ class User(AbstractUser):
         'Роль', max_length=42, choices=CHOICES, default=CHOICES[0][0]
     )
     confirmation_code = models.CharField(max_length=32, blank=True)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     admin_methods = ('POST', 'PUT', 'PATCH', 'DELETE',)
+    # Поля, которые копируются в токен при выдаче: по ним проверяются
+    # права без запроса к таблице пользователей.
+    token_fields = ('username', 'role', 'is_staff', 'is_superuser',
+                    'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(cls.token_fields).issubset(field_names):
+            instance._loaded_token_claims = instance.token_claims()
+        return instance
+
+    def token_claims(self):
+        return {field: getattr(self, field) for field in self.token_fields}
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_token_claims', None)
+        if loaded is not None and loaded != self.token_claims():
+            # Роль или права изменились: ранее выданные токены отзываются.
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'token_version'
+                }
+        super().save(*args, **kwargs)
+        self._loaded_token_claims = self.token_claims()
+
+    def refresh_from_db(self, using=None, fields=None):
+        # У пользователя из токена загружены только поля из claims: при
+        # обращении к любому другому полю догружается вся строка, а не
+        # одно поле.
+        deferred = self.get_deferred_fields()
+        if fields and deferred.issuperset(fields):
+            fields = deferred
+        super().refresh_from_db(using, fields)
 
     @property
     def is_moderator(self):
@@ -39,3 +76,49 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ('username',)
+
+
+class EmailJob(models.Model):
+    """Письмо в очереди на отправку (outbox)."""
+
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'В очереди'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    ]
+
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    to = models.EmailField('Получатель', max_length=254)
+    status = models.CharField(
+        'Статус', max_length=16, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    locked_by = models.CharField(max_length=36, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('next_attempt_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='emailjob_status_next_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
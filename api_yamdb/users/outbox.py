@@ -0,0 +1,124 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import EmailJob
+
+MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+BACKOFF = timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_BACKOFF', 30))
+MAX_BACKOFF = timedelta(hours=1)
+# Письма, захваченные упавшим обработчиком, возвращаются в очередь.
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    return EmailJob.objects.create(
+        subject=subject,
+        body=body,
+        to=to,
+        from_email=from_email or settings.SENDER,
+    )
+
+
+def claim_jobs(limit):
+    """Захватывает до ``limit`` готовых к отправке писем.
+
+    Захват — условный UPDATE по статусу, поэтому несколько обработчиков
+    не отправят одно письмо дважды даже без SELECT ... FOR UPDATE.
+    """
+    now = timezone.now()
+    ready = Q(status=EmailJob.PENDING, next_attempt_at__lte=now) | Q(
+        status=EmailJob.SENDING, locked_at__lt=now - LOCK_TIMEOUT
+    )
+    ids = list(
+        EmailJob.objects.filter(ready)
+        .order_by('next_attempt_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    token = str(uuid.uuid4())
+    EmailJob.objects.filter(ready, pk__in=ids).update(
+        status=EmailJob.SENDING, locked_by=token, locked_at=now
+    )
+    return list(EmailJob.objects.filter(locked_by=token))
+
+
+def send_chunk(jobs):
+    """Отправляет письма через одно соединение с почтовым сервером.
+
+    Возвращает пары (письмо, ошибка или None); БД здесь не трогается,
+    результаты сохраняет вызывающий поток.
+    """
+    results = []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        return [(job, error) for job in jobs]
+    try:
+        for job in jobs:
+            message = EmailMessage(
+                job.subject, job.body, job.from_email, [job.to],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                results.append((job, error))
+            else:
+                results.append((job, None))
+    finally:
+        connection.close()
+    return results
+
+
+def record_results(results):
+    now = timezone.now()
+    sent = []
+    for job, error in results:
+        if error is None:
+            sent.append(job.pk)
+            continue
+        job.attempts += 1
+        job.last_error = repr(error)
+        job.locked_by = ''
+        job.locked_at = None
+        if job.attempts >= MAX_ATTEMPTS:
+            job.status = EmailJob.FAILED
+        else:
+            job.status = EmailJob.PENDING
+            job.next_attempt_at = now + min(
+                BACKOFF * 2 ** (job.attempts - 1), MAX_BACKOFF
+            )
+        job.save(update_fields=(
+            'attempts', 'last_error', 'locked_by', 'locked_at', 'status',
+            'next_attempt_at',
+        ))
+    EmailJob.objects.filter(pk__in=sent).update(
+        status=EmailJob.SENT, sent_at=now, locked_by='', locked_at=None
+    )
+    return len(sent), len(results) - len(sent)
+
+
+def deliver(batch_size=100, workers=4):
+    """Отправляет одну пачку писем пулом потоков.
+
+    Возвращает (отправлено, с ошибкой) или None, если очередь пуста.
+    """
+    jobs = claim_jobs(batch_size)
+    if not jobs:
+        return None
+    chunks = [jobs[index::workers] for index in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = [
+            result
+            for chunk_results in executor.map(send_chunk, filter(None, chunks))
+            for result in chunk_results
+        ]
+    return record_results(results)
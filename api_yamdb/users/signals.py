@@ -0,0 +1,17 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.authentication import token_version_key
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_token_version(sender, instance, **kwargs):
+    # Версия перечитается из БД при следующем запросе с токеном: после
+    # смены роли или удаления пользователя его токены перестанут
+    # приниматься.
+    key = token_version_key(instance.pk)
+    transaction.on_commit(lambda: cache.delete(key))
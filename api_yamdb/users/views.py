@@ -7,6 +7,8 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from .models import User
+from core import metrics
+from core.profiling import ProfiledSerializerMixin
 from api.permissions import OnlyAdminAndSuperuser
 from api.serializers import (
     AdminUserSerializer,
@@ -20,13 +22,8 @@ from api.serializers import (
 @permission_classes([permissions.AllowAny])
 def get_token(request):
     serializer = GetTokenSerializer(data=request.data)
-
-    if serializer.is_valid(raise_exception=True):
-        serializer = GetTokenSerializer(data=serializer.data)
-
-    if serializer.is_valid():
-        data = {'token': serializer.data.get('token')}
-        return Response(data, status=status.HTTP_200_OK)
+    serializer.is_valid(raise_exception=True)
+    return Response(serializer.save(), status=status.HTTP_200_OK)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -35,11 +32,21 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
 
     def create(self, request, *args, **kwargs):
+        user = User.objects.filter(
+            username=request.data.get('username'),
+            email=request.data.get('email'),
+        ).first()
+        if user is not None:
+            # Повторная регистрация выдаёт новый код: старый одноразовый.
+            self.get_serializer_class().send_confirmation_code(user)
+            metrics.SIGNUPS.labels('repeat').inc()
+            serializer = self.get_serializer(user)
+            return Response(serializer.data, status=status.HTTP_200_OK)
         response = super().create(request, *args, **kwargs)
         return Response(response.data, status=status.HTTP_200_OK)
 
 
-class AdminViewSet(viewsets.ModelViewSet):
+class AdminViewSet(ProfiledSerializerMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = AdminUserSerializer
     permission_classes = (permissions.IsAuthenticated, OnlyAdminAndSuperuser)
@@ -0,0 +1,11 @@
+import pytest
+from django.core.management import call_command
+
+from .dataset import seed
+
+
+@pytest.fixture(scope='module')
+def dataset(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        yield seed()
+        call_command('flush', verbosity=0, interactive=False)
@@ -0,0 +1,138 @@
+import os
+from dataclasses import dataclass
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+
+from categories.models import Category, Genre, Title, TitleGenre
+from reviews.models import Comment, Review
+from reviews.ratings import rebuild_title_ratings
+from reviews.stats import rebuild_title_stats
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+@dataclass
+class DatasetSize:
+    """Размер синтетического набора данных.
+
+    По умолчанию набор маленький, чтобы бенчмарк проходил вместе
+    с остальными тестами; для нагрузочного прогона размеры задаются
+    переменными окружения, например
+    ``BENCHMARK_TITLES=5000 BENCHMARK_REVIEWS=300000 pytest tests/benchmark``.
+    """
+
+    titles: int = env_int('BENCHMARK_TITLES', 50)
+    users: int = env_int('BENCHMARK_USERS', 20)
+    reviews: int = env_int('BENCHMARK_REVIEWS', 500)
+    comments: int = env_int('BENCHMARK_COMMENTS', 1000)
+    genres: int = env_int('BENCHMARK_GENRES', 10)
+    categories: int = env_int('BENCHMARK_CATEGORIES', 5)
+    batch_size: int = env_int('BENCHMARK_BATCH_SIZE', 5000)
+
+
+@dataclass
+class Dataset:
+    admin: object
+    title: Title
+    review: Review
+    comment: Comment
+    genre: Genre
+    category: Category
+
+
+def batched(objects, size):
+    iterator = iter(objects)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_create(model, objects, batch_size):
+    for batch in batched(objects, batch_size):
+        model.objects.bulk_create(batch)
+
+
+def seed(size=None):
+    """Заполняет пустую БД синтетическими данными.
+
+    Первичные ключи задаются явно: SQLite не возвращает их из
+    ``bulk_create``. Первое произведение и первый отзыв «горячие»:
+    на них приходится больше всего отзывов и комментариев.
+    """
+    size = size or DatasetSize()
+    users_count = max(size.users, 1)
+    reviews_count = min(size.reviews, size.titles * users_count)
+
+    User = get_user_model()
+    admin = User.objects.create_user(
+        username='BenchAdmin', email='benchadmin@yamdb.fake',
+        password='1234567', role='admin',
+    )
+    bulk_create(User, (
+        User(
+            id=admin.pk + number, username=f'bench_user_{number}',
+            email=f'bench_user_{number}@yamdb.fake',
+        )
+        for number in range(1, users_count + 1)
+    ), size.batch_size)
+
+    bulk_create(Category, (
+        Category(id=number, name=f'Категория {number}', slug=f'category-{number}')
+        for number in range(1, size.categories + 1)
+    ), size.batch_size)
+    bulk_create(Genre, (
+        Genre(id=number, name=f'Жанр {number}', slug=f'genre-{number}')
+        for number in range(1, size.genres + 1)
+    ), size.batch_size)
+    bulk_create(Title, (
+        Title(
+            id=number, name=f'Произведение {number}',
+            year=1900 + number % 120,
+            description=f'Описание произведения {number}',
+            category_id=number % size.categories + 1,
+        )
+        for number in range(1, size.titles + 1)
+    ), size.batch_size)
+    bulk_create(TitleGenre, (
+        TitleGenre(title_id=number, genre_id=(number + shift) % size.genres + 1)
+        for number in range(1, size.titles + 1)
+        for shift in range(min(3, size.genres))
+    ), size.batch_size)
+
+    # Отзывы идут «по авторам»: каждый автор пишет по отзыву на
+    # произведения 1, 2, 3..., поэтому у первого произведения их больше всех.
+    bulk_create(Review, (
+        Review(
+            id=number + 1,
+            title_id=number // users_count + 1,
+            author_id=admin.pk + number % users_count + 1,
+            text=f'Отзыв {number}',
+            score=number % 10 + 1,
+        )
+        for number in range(reviews_count)
+    ), size.batch_size)
+    bulk_create(Comment, (
+        Comment(
+            review_id=1 if number % 2 else number % reviews_count + 1,
+            author_id=admin.pk + number % users_count + 1,
+            text=f'Комментарий {number}',
+        )
+        for number in range(size.comments)
+    ), size.batch_size)
+    rebuild_title_ratings()
+    rebuild_title_stats()
+
+    review = Review.objects.get(pk=1)
+    return Dataset(
+        admin=admin,
+        title=review.title,
+        review=review,
+        comment=Comment.objects.filter(review=review).first(),
+        genre=Genre.objects.first(),
+        category=Category.objects.first(),
+    )
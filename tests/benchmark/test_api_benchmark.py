@@ -0,0 +1,191 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.urls import router_v1
+
+BUDGETS_PATH = os.getenv(
+    'BENCHMARK_BUDGETS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'budgets.json'),
+)
+ROUNDS = int(os.getenv('BENCHMARK_ROUNDS', 5))
+# По умолчанию каждый запрос идёт мимо кэша ответов, чтобы бюджеты
+# отражали работу с БД; BENCHMARK_WARM_CACHE=1 замеряет попадания в кэш.
+WARM_CACHE = os.getenv('BENCHMARK_WARM_CACHE') == '1'
+REPORT_PATH = os.getenv('BENCHMARK_REPORT')
+# Время и память зависят от машины, поэтому по умолчанию проверяется
+# только число SQL-запросов; BENCHMARK=1 включает все бюджеты.
+ENFORCED_METRICS = None if os.getenv('BENCHMARK') == '1' else {'queries'}
+
+ROUTES = [
+    url.name for url in router_v1.urls if 'get' in url.callback.actions
+]
+
+with open(BUDGETS_PATH, encoding='utf-8') as budgets_file:
+    BUDGETS = json.load(budgets_file)
+
+RESULTS = {}
+
+
+def route_kwargs(name, dataset):
+    basename = name.rsplit('-', 1)[0]
+    values = {
+        'title_id': dataset.title.pk,
+        'review_id': dataset.review.pk,
+        'username': dataset.admin.username,
+        'slug': {
+            'genres': dataset.genre.slug,
+            'categories': dataset.category.slug,
+        }.get(basename),
+        'pk': {
+            'titles': dataset.title.pk,
+            'reviews': dataset.review.pk,
+            'comments': dataset.comment.pk,
+            # `users/{pk}/` перекрывается маршрутом `users/{username}/`.
+            'users': dataset.admin.username,
+        }.get(basename),
+    }
+    url = next(url for url in router_v1.urls if url.name == name)
+    return {key: values[key] for key in url.pattern.regex.groupindex}
+
+
+def percentile(timings, percent):
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method='inclusive')[percent - 1]
+
+
+@pytest.fixture(scope='module', autouse=True)
+def report():
+    yield
+    lines = [
+        f'{"route":<24}{"queries":>8}{"p50, ms":>10}{"p95, ms":>10}'
+        f'{"memory, KB":>12}{"req/s":>10}'
+    ]
+    for name, result in RESULTS.items():
+        lines.append(
+            f'{name:<24}{result["queries"]:>8}{result["p50_ms"]:>10.2f}'
+            f'{result["p95_ms"]:>10.2f}{result["memory_kb"]:>12.1f}'
+            f'{1000 / result["p50_ms"]:>10.0f}'
+        )
+    print('\n' + '\n'.join(lines))
+    if REPORT_PATH:
+        with open(REPORT_PATH, 'w', encoding='utf-8') as report_file:
+            json.dump(RESULTS, report_file, ensure_ascii=False, indent=2)
+
+
+@pytest.fixture
+def bench_client(dataset):
+    client = APIClient()
+    token = AccessToken.for_user(dataset.admin)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def get(client, url):
+    if not WARM_CACHE:
+        for cache in caches.all():
+            cache.clear()
+    return client.get(url)
+
+
+def measure(client, url):
+    response = get(client, url)
+    assert response.status_code == 200, (
+        f'Бенчмарк ожидает статус 200 при GET запросе `{url}`, '
+        f'получен {response.status_code}'
+    )
+    with CaptureQueriesContext(connection) as context:
+        get(client, url)
+    queries = len(context.captured_queries)
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        get(client, url)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    try:
+        get(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'queries': queries,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'memory_kb': peak / 1024,
+    }
+
+
+def check_budget(name, url, result):
+    RESULTS[name] = result
+    budget = BUDGETS[name]
+    exceeded = {
+        metric: (result[metric], limit)
+        for metric, limit in budget.items()
+        if (ENFORCED_METRICS is None or metric in ENFORCED_METRICS)
+        and result[metric] > limit
+    }
+    assert not exceeded, (
+        f'`{url}` превышает бюджет (значение, лимит): {exceeded}'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ROUTES)
+def test_route_within_budget(name, dataset, bench_client):
+    assert name in BUDGETS, (
+        f'Для маршрута `{name}` не задан бюджет в `{BUDGETS_PATH}`'
+    )
+    url = reverse(name, kwargs=route_kwargs(name, dataset))
+    check_budget(name, url, measure(bench_client, url))
+
+
+@pytest.mark.django_db
+def test_token_within_budget(dataset):
+    user = dataset.comment.author
+    client = APIClient()
+    url = reverse('get_token')
+
+    def issue_token():
+        # Код одноразовый, поэтому перед каждым запросом выдаётся заново.
+        user_model.objects.filter(pk=user.pk).update(confirmation_code='code')
+        started = time.perf_counter()
+        response = client.post(
+            url, {'username': user.username, 'confirmation_code': 'code'}
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        assert response.status_code == 200
+        return elapsed
+
+    user_model = type(user)
+    issue_token()
+    user_model.objects.filter(pk=user.pk).update(confirmation_code='code')
+    with CaptureQueriesContext(connection) as context:
+        client.post(
+            url, {'username': user.username, 'confirmation_code': 'code'}
+        )
+    queries = len(context.captured_queries)
+    timings = [issue_token() for _ in range(ROUNDS)]
+    tracemalloc.start()
+    try:
+        issue_token()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    check_budget('get_token', url, {
+        'queries': queries,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'memory_kb': peak / 1024,
+    })
@@ -0,0 +1,81 @@
+import json
+import os
+import statistics
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import (
+    FastJSONRenderer, MessagePackRenderer, msgpack, orjson,
+)
+from api.serializers import ReviewSerializer, TitleSerializer
+from categories.models import Title
+from reviews.models import Review
+
+ROUNDS = int(os.getenv('BENCHMARK_ROUNDS', 5))
+# Сколько отзывов сериализуется: несколько страниц списка подряд.
+REVIEWS = int(os.getenv('BENCHMARK_RENDER_REVIEWS', 500))
+
+RENDERERS = {
+    'json': (JSONRenderer(), json.loads),
+    'orjson': (FastJSONRenderer(), json.loads) if orjson else None,
+    'msgpack': (MessagePackRenderer(), msgpack.unpackb) if msgpack else None,
+}
+
+RESULTS = {}
+
+
+def titles_payload():
+    titles = Title.objects.select_related(
+        'category', 'stats'
+    ).prefetch_related('genre').order_by('name')
+    return TitleSerializer(
+        titles, many=True, context={'with_stats': True}
+    ).data
+
+
+def reviews_payload():
+    reviews = Review.objects.select_related('author').order_by('-pub_date')
+    return ReviewSerializer(reviews[:REVIEWS], many=True).data
+
+
+PAYLOADS = {'titles': titles_payload, 'reviews': reviews_payload}
+
+
+@pytest.fixture(scope='module', autouse=True)
+def report():
+    yield
+    lines = [
+        f'{"payload":<10}{"renderer":<10}{"encode, ms":>12}{"size, KB":>10}'
+    ]
+    for (payload, renderer), result in RESULTS.items():
+        lines.append(
+            f'{payload:<10}{renderer:<10}{result["encode_ms"]:>12.3f}'
+            f'{result["size_kb"]:>10.1f}'
+        )
+    print('\n' + '\n'.join(lines))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('renderer_name', RENDERERS)
+@pytest.mark.parametrize('payload_name', PAYLOADS)
+def test_renderer_speed_and_size(payload_name, renderer_name, dataset):
+    if RENDERERS[renderer_name] is None:
+        pytest.skip(f'{renderer_name} не установлен')
+    renderer, decode = RENDERERS[renderer_name]
+    data = PAYLOADS[payload_name]()
+    reference = JSONRenderer().render(data)
+    rendered = renderer.render(data)
+    assert decode(rendered) == json.loads(reference), (
+        f'{renderer_name} кодирует `{payload_name}` не так, как JSONRenderer'
+    )
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        renderer.render(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    RESULTS[payload_name, renderer_name] = {
+        'encode_ms': statistics.median(timings),
+        'size_kb': len(rendered) / 1024,
+    }
@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.management import call_command
 
 User = get_user_model()
 
@@ -85,6 +86,8 @@ class Test00UserRegistration:
         }
         request_type = 'POST'
         response = client.post(self.url_signup, data=valid_data)
+        # письма отправляются из очереди отдельным обработчиком
+        call_command('send_emails', '--once')
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != 404, (
@@ -0,0 +1,54 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08TitleRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_is_stored(self, admin_client, admin):
+        from categories.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что при создании отзыва обновляются сумма и количество оценок произведения'
+        )
+        assert title.rating == 4
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/', data={'score': 9}
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (18, 3), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается рейтинг произведения'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (13, 2), (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг произведения'
+        )
+        assert title.rating == 6.5
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_command(self, client, admin_client, admin):
+        from categories.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        urls = (f'/api/v1/titles/{titles[0]["id"]}/', '/api/v1/titles/')
+        for url in urls:
+            client.get(url)
+        call_command('rebuild_title_ratings')
+        assert client.get(urls[0]).json()['rating'] == 4, (
+            'Проверьте, что после пересчёта рейтингов кэш произведения сбрасывается'
+        )
+        assert client.get(urls[1]).json()['results'][0]['rating'] == 4, (
+            'Проверьте, что после пересчёта рейтингов кэш списка произведений сбрасывается'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (12, 3, 4)
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (0, 0, None)
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+class Test09TitleQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_constant_queries(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        queries_before = count_queries(client, '/api/v1/titles/')
+        for number in range(8):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}', 'year': 2000 + number,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[0]['slug'],
+            })
+        assert count_queries(client, '/api/v1/titles/') == queries_before, (
+            'Проверьте, что количество запросов к БД при GET запросе `/api/v1/titles/` '
+            'не зависит от количества произведений на странице'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_genre_unique(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={
+            'genre': [genres[0]['slug'], genres[0]['slug']]
+        })
+        assert response.status_code == 200, (
+            'Проверьте, что повторный жанр в запросе не нарушает уникальность '
+            'пары произведение-жанр'
+        )
+        assert [genre['slug'] for genre in response.json()['genre']] == [genres[0]['slug']]
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.json()['genre'] == [], (
+            'Проверьте, что при удалении жанра удаляются и его связи с произведениями'
+        )
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN')
+    @pytest.mark.django_db
+    def test_03_listing_indexes(self):
+        from reviews.models import Comment, Review
+
+        plans = {
+            'review_title_pub_date_idx': Review.objects.filter(title_id=1),
+            'comment_review_pub_date_idx': Comment.objects.filter(review_id=1),
+        }
+        for index, queryset in plans.items():
+            sql, params = queryset.order_by('pub_date', 'pk').query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что список отзывов и комментариев читается по индексу {index} '
+                'без сортировки'
+            )
@@ -0,0 +1,51 @@
+import pytest
+
+from .common import create_categories, create_titles
+
+
+class Test10CatalogCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_cache_invalidation(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url)['X-Cache'] == 'MISS'
+        assert client.get(url)['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET запрос `/api/v1/titles/{title_id}/` отдаётся из кэша'
+        )
+        assert client.get('/api/v1/titles/?year=2000&name=')['X-Cache'] == 'MISS'
+        assert client.get('/api/v1/titles/?name=&year=2000')['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кэша не зависит от порядка параметров запроса'
+        )
+
+        admin_client.post(f'{url}reviews/', data={'text': 'Отзыв', 'score': 8})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS' and response.json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения'
+        )
+        assert client.get(f'/api/v1/titles/{titles[1]["id"]}/')['X-Cache'] == 'MISS'
+        assert client.get(f'/api/v1/titles/{titles[1]["id"]}/')['X-Cache'] == 'HIT'
+        admin_client.post(f'{url}reviews/', data={'text': 'Ещё отзыв', 'score': 6}, )
+        assert client.get(f'/api/v1/titles/{titles[1]["id"]}/')['X-Cache'] == 'HIT', (
+            'Проверьте, что отзыв сбрасывает кэш только своего произведения'
+        )
+
+        admin_client.patch(f'/api/v1/genres/{genres[0]["slug"]}/', data={'name': 'Хоррор'})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанра сбрасывает кэш произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_category_cache_and_stats(self, client, admin_client, user_client):
+        create_categories(admin_client)
+        assert client.get('/api/v1/categories/')['X-Cache'] == 'MISS'
+        assert client.get('/api/v1/categories/')['X-Cache'] == 'HIT'
+        admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS' and response.json()['count'] == 3
+
+        assert user_client.get('/api/v1/cache/stats/').status_code == 403
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.status_code == 200
+        assert {'hits', 'misses', 'hit_ratio'} <= set(response.json())
@@ -0,0 +1,122 @@
+import pytest
+from django.utils.http import http_date, parse_http_date
+
+from .common import create_comments
+
+
+@pytest.fixture
+def shared_catalog_cache(settings, tmp_path):
+    settings.CACHES = {
+        **settings.CACHES,
+        'catalog': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'catalog'),
+        },
+    }
+
+
+class Test11ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_etag(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and not response.has_header('Last-Modified'), (
+            'Проверьте, что список отзывов возвращает ETag без Last-Modified'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается статус 304'
+        )
+        detail = client.get(f'{url}{reviews[0]["id"]}/')
+        response = client.get(f'{url}{reviews[0]["id"]}/', HTTP_IF_MODIFIED_SINCE=detail['Last-Modified'])
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-Modified-Since для отзыва возвращается статус 304'
+        )
+        assert client.get(f'{url}?page=2', HTTP_IF_NONE_MATCH=etag).status_code != 304
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Исправлено'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            'Проверьте, что изменение отзыва меняет ETag списка отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_and_titles_etag(self, client, admin_client, admin, shared_catalog_cache):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.delete(f'{url}{comments[0]["id"]}/')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.post(f'{url}reviews/', data={'text': 'Новый', 'score': 1})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_edit_in_other_worker(self, client, admin_client, admin, monkeypatch):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        etags = {path: client.get(path)['ETag'] for path in (url, f'{url}{reviews[0]["id"]}/', comments_url)}
+        # Запись в другом воркере не сдвигает версии в locmem этого процесса.
+        monkeypatch.setattr('api.cache.bump', lambda resource, pk=None: None)
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Исправлено'})
+        admin_client.patch(f'{comments_url}{comments[0]["id"]}/', data={'text': 'Исправлено'})
+        for path, etag in etags.items():
+            response = client.get(path, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200 and response['ETag'] != etag, (
+                'Проверьте, что ETag отзывов и комментариев строится по состоянию БД '
+                'и меняется после изменения текста'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_titles_need_shared_cache(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == 200 and not response.has_header('ETag'), (
+            'Проверьте, что без общего кэша каталога ETag произведений не отдаётся'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_delete_and_if_modified_since(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        # Время последнего изменения, которое клиент знает по ответам API.
+        since = http_date(max(
+            parse_http_date(client.get(f'{path}{obj["id"]}/')['Last-Modified'])
+            for path, obj in ((url, reviews[-1]), (comments_url, comments[0]))
+        ))
+        admin_client.delete(f'{comments_url}{comments[0]["id"]}/')
+        admin_client.delete(f'{url}{reviews[1]["id"]}/')
+        for path in (url, comments_url):
+            response = client.get(path, HTTP_IF_MODIFIED_SINCE=since)
+            assert response.status_code == 200, (
+                'Проверьте, что после удаления объекта список не отвечает 304 '
+                'по If-Modified-Since'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_validators_follow_filters(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url, {'search': 'qwerty'})['ETag']
+        other = reviews[-1]
+        admin_client.patch(f'{url}{other["id"]}/', data={'text': 'Другое'})
+        response = client.get(url, {'search': 'qwerty'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        etag = response['ETag']
+        admin_client.patch(f'{url}{other["id"]}/', data={'text': 'Ещё другое'})
+        response = client.get(url, {'search': 'qwerty'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что ETag списка строится по тем же отфильтрованным '
+            'объектам, что и ответ'
+        )
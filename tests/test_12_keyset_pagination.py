@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+
+class Test12KeysetPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_keyset_pages(self, client, admin_client, admin, django_user_model):
+        from reviews.models import Review
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        authors = django_user_model.objects.bulk_create([
+            django_user_model(username=f'reader{number}', email=f'reader{number}@yamdb.fake')
+            for number in range(20)
+        ])
+        Review.objects.bulk_create([
+            Review(title_id=title_id, author=author, text='Отзыв', score=5)
+            for author in django_user_model.objects.filter(username__startswith='reader')
+        ])
+        expected = list(
+            Review.objects.filter(title_id=title_id).order_by('pub_date', 'id').values_list('id', flat=True)
+        )
+        assert len(authors) == 20 and len(expected) == 23
+
+        url = f'/api/v1/titles/{title_id}/reviews/?pagination=cursor'
+        seen = []
+        pages = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что пагинация по курсору не считает количество объектов'
+            )
+            pages.append(data)
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert seen == expected, (
+            'Проверьте, что пагинация по курсору отдаёт все отзывы в порядке (pub_date, id)'
+        )
+        assert pages[0]['previous'] is None
+        previous = client.get(pages[-1]['previous']).json()
+        assert [review['id'] for review in previous['results']] == expected[10:20]
+
+        data = client.get(f'/api/v1/titles/{title_id}/reviews/').json()
+        assert data['count'] == 23, (
+            'Проверьте, что постраничная пагинация по-прежнему доступна по умолчанию'
+        )
+        assert client.get(f'/api/v1/titles/{title_id}/reviews/?cursor=bad').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_keyset_etag_without_aggregate(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'pagination': 'cursor'})
+            sql = [query['sql'].upper() for query in context.captured_queries]
+        etag = response['ETag']
+        assert etag and response.json()['results'], (
+            'Проверьте, что пагинация по курсору отдаёт ETag'
+        )
+        assert not any('COUNT(' in query or 'MAX(' in query for query in sql), (
+            'Проверьте, что при пагинации по курсору ETag не строится агрегатом по всем отзывам'
+        )
+        assert len(sql) == 1, (
+            'Проверьте, что страница для ETag и для ответа загружается одним запросом'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'pagination': 'cursor'}, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304 and len(context.captured_queries) == 1
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Исправлено'})
+        response = client.get(url, {'pagination': 'cursor'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение отзыва на странице меняет ETag'
+        )
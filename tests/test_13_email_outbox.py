@@ -0,0 +1,56 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+class Test13EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_email(self, client):
+        from users.models import EmailJob
+
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.url_signup, data={'email': 'queued@yamdb.fake', 'username': 'queued'})
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что письмо с кодом подтверждения не отправляется во время запроса'
+        )
+        job = EmailJob.objects.get(to='queued@yamdb.fake')
+        assert job.status == EmailJob.PENDING
+
+        call_command('send_emails', '--once')
+        job.refresh_from_db()
+        assert job.status == EmailJob.SENT and job.sent_at
+        assert len(mail.outbox) == outbox_before_count + 1
+        user_code = job.body.split('Ваш код подтверждения: ')[1].split('.')[0]
+        from users.models import User
+        assert User.objects.get(username='queued').confirmation_code == user_code
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_delivery_is_retried(self):
+        from users.models import EmailJob
+        from users.outbox import MAX_ATTEMPTS, deliver, enqueue_email
+
+        job = enqueue_email('Тема', 'Текст', 'retry@yamdb.fake')
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+            assert deliver() == (0, 1)
+        job.refresh_from_db()
+        assert job.status == EmailJob.PENDING and job.attempts == 1
+        assert 'SMTP down' in job.last_error
+        assert deliver() is None, (
+            'Проверьте, что повторная отправка откладывается'
+        )
+
+        EmailJob.objects.filter(pk=job.pk).update(attempts=MAX_ATTEMPTS - 1, next_attempt_at=job.created)
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+            deliver()
+        job.refresh_from_db()
+        assert job.status == EmailJob.FAILED
+
+        outbox_before_count = len(mail.outbox)
+        enqueue_email('Тема', 'Текст', 'ok@yamdb.fake')
+        assert deliver() == (1, 0)
+        assert len(mail.outbox) == outbox_before_count + 1
@@ -0,0 +1,43 @@
+import re
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def signup_and_get_code(client, data):
+    assert client.post('/api/v1/auth/signup/', data=data).status_code == 200
+    call_command('send_emails', '--once')
+    return re.search(r'код подтверждения: (\w+)', mail.outbox[-1].body).group(1)
+
+
+class Test14Token:
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_token_is_issued_once(self, client):
+        data = {'username': 'token_user', 'email': 'token_user@yamdb.fake'}
+        code = signup_and_get_code(client, data)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url_token, data={'username': data['username'], 'confirmation_code': code})
+        assert response.status_code == 200 and response.json().get('token'), (
+            'Проверьте, что по верному коду подтверждения выдаётся токен'
+        )
+        assert len(context.captured_queries) == 2, (
+            'Проверьте, что выдача токена делает один запрос за пользователем и один на сброс кода'
+        )
+
+        response = client.post(self.url_token, data={'username': data['username'], 'confirmation_code': code})
+        assert response.status_code == 400, (
+            'Проверьте, что код подтверждения нельзя использовать повторно'
+        )
+
+        new_code = signup_and_get_code(client, data)
+        assert new_code != code, (
+            'Проверьте, что повторная регистрация с теми же username и email выдаёт новый код'
+        )
+        response = client.post(self.url_token, data={'username': data['username'], 'confirmation_code': new_code})
+        assert response.status_code == 200
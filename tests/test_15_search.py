@@ -0,0 +1,55 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test15Search:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_endpoint(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = client.get('/api/v1/search/?q=пово')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/search/` доступен без токена'
+        )
+        data = response.json()
+        assert [title['name'] for title in data['titles']] == ['Поворот туда'], (
+            'Проверьте, что поиск находит произведения по префиксу слова'
+        )
+        data = client.get('/api/v1/search/?q=qwerty123&type=reviews,comments').json()
+        assert set(data) == {'reviews', 'comments'}
+        assert [review['id'] for review in data['reviews']] == [reviews[1]['id']]
+        assert data['reviews'][0]['title_id'] == titles[0]['id']
+        assert [comment['id'] for comment in data['comments']] == [comments[1]['id']]
+        assert data['comments'][0]['review_id'] == reviews[0]['id']
+
+        assert client.get('/api/v1/search/').status_code == 400
+        assert client.get('/api/v1/search/?q=a&type=users').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_index_follows_changes(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Шедевр'})
+        data = client.get('/api/v1/search/?q=шедевр&type=titles').json()
+        assert [title['id'] for title in data['titles']] == [titles[1]['id']], (
+            'Проверьте, что поисковый индекс обновляется при изменении произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        data = client.get('/api/v1/search/?q=шедевр&type=titles').json()
+        assert data['titles'] == []
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = client.get(f'{url}?search=qwerty32').json()
+        assert [review['id'] for review in data['results']] == [reviews[2]['id']], (
+            'Проверьте, что `?search=` ищет по тексту отзывов'
+        )
+        data = client.get('/api/v1/titles/?search=поворот ту').json()
+        assert [title['name'] for title in data['results']] == ['Поворот туда'], (
+            'Проверьте, что `?search=` ищет по названию произведений'
+        )
+        data = client.get('/api/v1/titles/?search=крутое пи').json()
+        assert data['results'] == [], (
+            'Проверьте, что `?search=` у произведений, как и `search_fields`, не ищет по описанию'
+        )
+        data = client.get('/api/v1/search/?q=крутое пи&type=titles').json()
+        assert [title['id'] for title in data['titles']] == [titles[0]['id']]
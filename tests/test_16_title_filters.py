@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+def names(response):
+    assert response.status_code == 200
+    return sorted(title['name'] for title in response.json()['results'])
+
+
+class Test16TitleFilters:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_slug_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(f'/api/v1/titles/?genre={genres[1]["slug"]},{genres[2]["slug"]}')
+        assert names(response) == ['Поворот туда', 'Проект'], (
+            'Проверьте, что несколько жанров в `genre` объединяются через ИЛИ'
+        )
+        response = client.get(f'/api/v1/titles/?genre={genres[0]["slug"]}&genre={genres[2]["slug"]}')
+        assert names(response) == ['Поворот туда', 'Проект']
+        response = client.get(f'/api/v1/titles/?genre_all={genres[0]["slug"]},{genres[1]["slug"]}')
+        assert names(response) == ['Поворот туда'], (
+            'Проверьте, что `genre_all` оставляет произведения со всеми жанрами'
+        )
+        response = client.get(f'/api/v1/titles/?genre_all={genres[0]["slug"]},{genres[2]["slug"]}')
+        assert names(response) == []
+        response = client.get(f'/api/v1/titles/?category={categories[1]["slug"]}')
+        assert names(response) == ['Проект']
+        assert names(client.get('/api/v1/titles/?genre=unknown')) == [], (
+            'Проверьте, что фильтр по несуществующему слагу возвращает пустой список'
+        )
+        assert names(client.get(f'/api/v1/titles/?genre={genres[0]["slug"][:2]}')) == [], (
+            'Проверьте, что `genre` ищет слаг целиком, а не подстроку'
+        )
+        response = client.get(f'/api/v1/titles/?genre__icontains={genres[2]["slug"][1:-1]}')
+        assert names(response) == ['Проект'], (
+            'Проверьте, что поиск подстроки в слаге доступен через `genre__icontains`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_year_range(self, client, admin_client):
+        create_titles(admin_client)
+        assert names(client.get('/api/v1/titles/?year_min=2001')) == ['Проект']
+        assert names(client.get('/api/v1/titles/?year_max=2019')) == ['Поворот туда']
+        assert names(client.get('/api/v1/titles/?year_min=2000&year_max=2020')) == [
+            'Поворот туда', 'Проект'
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_slug_resolved_once(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/?genre={genres[0]["slug"]}&category={categories[0]["slug"]}'
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url + '&year=2000')
+            queries = [query['sql'] for query in context.captured_queries]
+        assert names(response) == ['Поворот туда']
+        assert not any('"slug" IN' in sql or 'LIKE' in sql for sql in queries), (
+            'Проверьте, что слаги переводятся в id один раз и кэшируются'
+        )
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert names(client.get(f'/api/v1/titles/?genre={genres[0]["slug"]}')) == []
+        admin_client.post('/api/v1/genres/', data={'name': 'Новый', 'slug': genres[0]['slug']})
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'genre': [genres[0]['slug']]}
+        )
+        assert names(client.get(f'/api/v1/titles/?genre={genres[0]["slug"]}')) == ['Проект'], (
+            'Проверьте, что кэш слагов сбрасывается при изменении жанров'
+        )
@@ -0,0 +1,82 @@
+import pytest
+from django.core.management import call_command
+
+from api import cache
+
+from .common import auth_client, create_reviews
+
+
+def histogram(**counts):
+    scores = {str(score): 0 for score in range(1, 11)}
+    scores.update({score.lstrip('s'): count for score, count in counts.items()})
+    return scores
+
+
+class Test17TitleStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats_follow_reviews(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/titles/{title_id}/stats/` доступен без токена'
+        )
+        data = response.json()
+        assert data['review_count'] == 3
+        assert data['scores'] == histogram(s3=1, s4=1, s5=1), (
+            'Проверьте, что статистика содержит гистограмму оценок'
+        )
+        assert data['last_review_at'] is not None
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/', data={'score': 9}
+        )
+        assert client.get(url).json()['scores'] == histogram(s4=1, s5=1, s9=1), (
+            'Проверьте, что при изменении оценки гистограмма пересчитывается'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[2]["id"]}/')
+        data = client.get(url).json()
+        assert (data['review_count'], data['scores']) == (2, histogram(s5=1, s9=1)), (
+            'Проверьте, что при удалении отзыва статистика пересчитывается'
+        )
+        review = admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        ).json()
+        assert data['last_review_at'] == review['pub_date']
+
+        data = client.get(f'/api/v1/titles/{titles[1]["id"]}/stats/').json()
+        assert (data['review_count'], data['last_review_at']) == (0, None)
+        assert client.get('/api/v1/titles/100500/stats/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_optional_field_and_rebuild(self, client, admin_client, admin):
+        from reviews.models import TitleStats
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        assert 'stats' not in client.get(f'/api/v1/titles/{titles[0]["id"]}/').json(), (
+            'Проверьте, что поле `stats` отдаётся только по запросу'
+        )
+        data = client.get('/api/v1/titles/?stats=true').json()
+        stats = {title['id']: title['stats']['review_count'] for title in data['results']}
+        assert stats == {titles[0]['id']: 3, titles[1]['id']: 0}, (
+            'Проверьте, что `?stats=true` добавляет статистику в ответ'
+        )
+
+        # Расхождение в обход сигналов, закэшированное в списке.
+        TitleStats.objects.update(review_count=0)
+        cache.bump('titles')
+        assert client.get('/api/v1/titles/?stats=true').json()['results'][0]['stats']['review_count'] == 0
+        TitleStats.objects.all().delete()
+        call_command('rebuild_title_stats')
+        data = client.get('/api/v1/titles/?stats=true').json()
+        assert data['results'][0]['stats']['review_count'] == 3, (
+            'Проверьте, что после пересчёта статистики кэш списка произведений сбрасывается'
+        )
+        stats = TitleStats.objects.get(pk=titles[0]['id'])
+        assert (stats.review_count, stats.histogram) == (3, histogram(s3=1, s4=1, s5=1))
+        assert TitleStats.objects.get(pk=titles[1]['id']).review_count == 0
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert not TitleStats.objects.filter(pk=titles[0]['id']).exists()
@@ -0,0 +1,44 @@
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from categories.models import Title
+
+from .common import create_comments
+
+pd = pytest.importorskip('pandas')
+
+
+class Test18ExportAnalytics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_csv(self, admin_client, admin, tmp_path):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        call_command('export_analytics', '--path', str(tmp_path), '--chunk-size', '2')
+        stored = dict(Title.objects.values_list('pk', 'weighted_rating'))
+        exported = pd.read_csv(tmp_path / 'titles.csv').set_index('title_id')
+        title = exported.loc[titles[0]['id']]
+        assert (title['reviews'], title['comments'], title['rating']) == (3, len(comments), 4), (
+            'Проверьте, что `export_analytics` считает отзывы, комментарии и рейтинг произведений'
+        )
+        assert title['weighted_rating'] == pytest.approx(stored[titles[0]['id']]) == pytest.approx(
+            (12 + settings.RATING_PRIOR_WEIGHT * settings.RATING_PRIOR_MEAN) / (3 + settings.RATING_PRIOR_WEIGHT)
+        ), (
+            'Проверьте, что взвешенный рейтинг в выгрузке совпадает с `weighted_rating` произведения'
+        )
+        other = exported.loc[titles[1]['id']]
+        assert other['reviews'] == 0
+        assert pd.isna(other['rating']) and other['weighted_rating'] == pytest.approx(stored[titles[1]['id']])
+
+        genres = pd.read_csv(tmp_path / 'genres.csv').set_index('slug')
+        assert genres.loc[titles[0]['genre'][0], 'reviews'] == 3
+        assert genres.loc[titles[1]['genre'][0], 'reviews'] == 0
+        categories = pd.read_csv(tmp_path / 'categories.csv').set_index('slug')
+        assert categories.loc[titles[0]['category'], 'rating'] == 4
+        years = pd.read_csv(tmp_path / 'years.csv').set_index('year')
+        assert years.loc[2000, 'titles'] == 1
+
+        authors = pd.read_csv(tmp_path / 'authors.csv').set_index('username')
+        assert authors.loc[user.username, 'reviews'] == 1
+        assert authors.loc[user.username, 'mean_score'] == 3
+        assert authors['comments'].sum() == len(comments)
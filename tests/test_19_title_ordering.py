@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews, create_titles
+
+
+def ordered(client, ordering):
+    response = client.get(f'/api/v1/titles/?ordering={ordering}')
+    assert response.status_code == 200
+    return [title['id'] for title in response.json()['results']]
+
+
+class Test19TitleOrdering:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Шедевр', 'score': 10})
+        empty = admin_client.post('/api/v1/titles/', data={
+            'name': 'Без отзывов', 'year': 1990, 'genre': titles[0]['genre'],
+            'category': titles[0]['category'],
+        }).json()['id']
+        top, rated = titles[1]['id'], titles[0]['id']
+
+        assert ordered(client, '-rating') == [top, rated, empty], (
+            'Проверьте, что `?ordering=-rating` сортирует по средней оценке, '
+            'произведения без оценок идут в конце'
+        )
+        # Взвешенный рейтинг: (сумма + 5 * 5.5) / (количество + 5).
+        assert ordered(client, '-weighted_rating') == [top, empty, rated], (
+            'Проверьте, что `?ordering=-weighted_rating` учитывает количество отзывов'
+        )
+        assert ordered(client, 'rating') == [empty, rated, top]
+        assert ordered(client, '-review_count') == [rated, top, empty]
+        assert ordered(client, 'review_count') == [empty, top, rated]
+        assert ordered(client, 'year') == [empty, rated, top]
+        assert ordered(client, '-name') == [top, rated, empty]
+        assert ordered(client, 'text') == ordered(client, ''), (
+            'Проверьте, что сортировка по неизвестному полю игнорируется'
+        )
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN')
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ordering_uses_index(self, client, admin_client):
+        create_titles(admin_client)
+        for ordering, index in (
+            ('-rating', 'title_rating_sort_idx'),
+            ('rating', 'title_rating_sort_idx'),
+            ('-weighted_rating', 'title_weighted_rating_idx'),
+            ('review_count', 'title_rating_count_idx'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                client.get(f'/api/v1/titles/?ordering={ordering}')
+                sql = next(
+                    query['sql'] for query in context.captured_queries
+                    if 'ORDER BY' in query['sql'] and 'categories_title' in query['sql']
+                )
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что `?ordering={ordering}` читает индекс {index}'
+            )
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import pytest
+
+from .common import create_titles
+
+
+class Test20RequestProfiling:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing(self, client, admin_client, settings, caplog):
+        from rest_framework.serializers import BaseSerializer
+
+        from core import profiling
+
+        data_property = BaseSerializer.__dict__['data']
+        create_titles(admin_client)
+        profiling.stats.reset()
+        settings.REQUEST_PROFILING = True
+        settings.REQUEST_PROFILING_SAMPLE_RATE = 1
+        logger = logging.getLogger('core.profiling')
+        logger.addHandler(caplog.handler)
+        try:
+            response = client.get('/api/v1/titles/')
+        finally:
+            logger.removeHandler(caplog.handler)
+        timing = response.get('Server-Timing', '')
+        assert timing.startswith('db;dur='), (
+            'Проверьте, что профилирование добавляет заголовок `Server-Timing`'
+        )
+        assert 'serialize;dur=' in timing and 'total;dur=' in timing
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['route'] == 'GET titles-list'
+        assert record['queries'] > 0 and record['slowest_queries']
+        assert record['serializer_ms'] > 0, (
+            'Проверьте, что в профиль попадает время сериализации'
+        )
+        assert BaseSerializer.__dict__['data'] is data_property, (
+            'Проверьте, что профилирование не подменяет `BaseSerializer.data` глобально'
+        )
+
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/?year=2000')
+        response = admin_client.get('/api/v1/profiling/stats/')
+        assert response.status_code == 200
+        route = response.json()['GET titles-list']
+        assert route['count'] == 3 and sum(route['buckets'].values()) == 3, (
+            'Проверьте, что статистика копится по маршрутам'
+        )
+        assert route['mean_queries'] > 0
+        assert client.get('/api/v1/profiling/stats/').status_code == 401
+        assert admin_client.delete('/api/v1/profiling/stats/').status_code == 204
+        assert 'GET titles-list' not in admin_client.get('/api/v1/profiling/stats/').json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_sampling(self, client, settings):
+        settings.REQUEST_PROFILING = True
+        settings.REQUEST_PROFILING_SAMPLE_RATE = 0
+        assert 'Server-Timing' not in client.get('/api/v1/titles/'), (
+            'Проверьте, что запросы вне выборки не профилируются'
+        )
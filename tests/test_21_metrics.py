@@ -0,0 +1,66 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+def sample(text, name, **labels):
+    from prometheus_client.parser import text_string_to_metric_families
+
+    for family in text_string_to_metric_families(text):
+        for metric in family.samples:
+            if metric.name == name and all(
+                metric.labels.get(key) == value for key, value in labels.items()
+            ):
+                return metric.value
+    return 0
+
+
+class Test21Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_metrics(self, client, admin_client, settings):
+        settings.METRICS_ENABLED = True
+        create_titles(admin_client)
+        before = client.get('/metrics').content.decode()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/100500/')
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'metrics_user', 'email': 'metrics@yamdb.fake'
+        })
+        assert response.status_code == 200
+
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        after = response.content.decode()
+
+        def delta(name, **labels):
+            return sample(after, name, **labels) - sample(before, name, **labels)
+
+        assert delta(
+            'yamdb_http_requests_total', route='titles-list', method='GET', status='200'
+        ) == 2, 'Проверьте, что /metrics считает запросы по маршрутам'
+        assert delta(
+            'yamdb_http_requests_total', route='titles-detail', method='GET', status='404'
+        ) == 1
+        assert delta(
+            'yamdb_http_request_duration_seconds_count', route='titles-list', method='GET'
+        ) == 2
+        assert delta('yamdb_http_request_db_queries_sum', route='titles-list') > 0
+        assert delta('yamdb_catalog_cache_lookups_total', result='hit') == 1
+        assert delta('yamdb_signups_total', kind='new') == 1
+        assert sample(after, 'yamdb_email_outbox_jobs', status='pending') == 1, (
+            'Проверьте, что /metrics показывает глубину очереди писем'
+        )
+        assert sample(after, 'yamdb_process_resident_memory_bytes') > 0
+
+        call_command('send_emails', '--once')
+        after = client.get('/metrics').content.decode()
+        assert sample(after, 'yamdb_email_outbox_jobs', status='pending') == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_disabled(self, client, settings):
+        settings.METRICS_ENABLED = False
+        assert client.get('/metrics').status_code == 404
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+
+class Test22Database:
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='PRAGMA')
+    @pytest.mark.django_db
+    def test_01_sqlite_pragmas(self, settings):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == settings.SQLITE_BUSY_TIMEOUT, (
+                'Проверьте, что при подключении к SQLite задаётся busy_timeout'
+            )
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что при подключении к SQLite задаётся synchronous=NORMAL'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_health_check(self, monkeypatch):
+        from core.db import check_connections
+
+        connection.ensure_connection()
+        closed = []
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 60)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+        monkeypatch.setattr(connection, 'is_usable', lambda: True)
+        check_connections()
+        assert closed == []
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        check_connections()
+        assert closed == [True], (
+            'Проверьте, что разорванное постоянное соединение закрывается в начале запроса'
+        )
+
+    def test_03_replica_router(self):
+        from categories.models import Title
+        from core import db
+
+        router = db.ReplicaRouter()
+        assert router.db_for_read(Title) is None
+        with db.use_replica('replica_1'):
+            assert router.db_for_read(Title) == 'replica_1', (
+                'Проверьте, что чтения внутри use_replica() идут на реплику'
+            )
+            assert router.db_for_write(Title) == 'default'
+        assert router.db_for_read(Title) is None
+        assert not router.allow_migrate('replica_1', 'categories')
+        pool = db.ReplicaPool(['replica_1', 'replica_2'])
+        assert [pool.next() for _ in range(3)] == [
+            'replica_1', 'replica_2', 'replica_1'
+        ], 'Проверьте, что реплики выбираются по кругу'
@@ -0,0 +1,140 @@
+import sqlite3
+
+import pytest
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from api.cache import get_cache, version_key
+from categories.models import Title
+from reviews.models import Review
+from tests.common import auth_client, create_reviews
+
+REPLICAS = ('replica_1', 'replica_2')
+
+
+@pytest.fixture
+def replicas(monkeypatch, tmp_path):
+    """Две реплики — файлы SQLite; ``sync()`` копирует в них основную БД."""
+    for alias in REPLICAS:
+        monkeypatch.setitem(connections.databases, alias, dict(
+            connection.settings_dict, NAME=str(tmp_path / f'{alias}.sqlite3')
+        ))
+        connections.ensure_defaults(alias)
+        connections.prepare_test_settings(alias)
+
+    def sync():
+        connection.ensure_connection()
+        for alias in REPLICAS:
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            connection.connection.backup(target)
+            target.close()
+
+    yield sync
+    for alias in REPLICAS:
+        connections[alias].close()
+        if hasattr(connections._connections, alias):
+            delattr(connections._connections, alias)
+
+
+def mark_replicas(review_id):
+    for alias in REPLICAS:
+        Review.objects.using(alias).filter(pk=review_id).update(text=alias)
+
+
+def age_versions(title_id):
+    # Ресурс изменён давно: реплики успели догнать основную БД.
+    get_cache().set(version_key('reviews', title_id), 1, None)
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='SQLite-реплики')
+class Test23ReadReplicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_round_robin(self, admin_client, admin, replicas, settings):
+        settings.DB_REPLICA_PIN_SECONDS = 0
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        replicas()
+        mark_replicas(reviews[0]['id'])
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        client = APIClient()
+        texts = [client.get(url).json()['text'] for _ in range(4)]
+        assert texts == ['replica_1', 'replica_2'] * 2, (
+            'Проверьте, что GET-запросы к отзывам читают реплики по кругу'
+        )
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 401
+        assert Review.objects.get(pk=reviews[0]['id']).text == 'qwerty', (
+            'Проверьте, что вне запросов чтения идут на основную БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_read_your_writes(self, admin_client, admin, replicas, settings):
+        settings.DB_REPLICA_PIN_SECONDS = 5
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        replicas()
+        mark_replicas(reviews[0]['id'])
+        age_versions(titles[0]['id'])
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        writer, reader = auth_client(admin), auth_client(user)
+        assert writer.get(url).json()['text'] in REPLICAS
+
+        response = writer.patch('/api/v1/users/me/', data={'bio': 'bio'})
+        assert response.status_code == 200
+        assert writer.get(url).json()['text'] == 'qwerty', (
+            'Проверьте, что после записи клиент читает из основной БД'
+        )
+        assert reader.get(url).json()['text'] in REPLICAS, (
+            'Проверьте, что закрепление за основной БД действует только на '
+            'клиента, который писал'
+        )
+
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        for alias in REPLICAS:
+            Title.objects.using(alias).filter(pk=titles[0]['id']).update(name=alias)
+        get_cache().set(version_key('titles'), 1, None)
+        get_cache().set(version_key('titles', titles[0]['id']), 1, None)
+        assert reader.get(title_url).json()['name'] in REPLICAS
+        response = writer.patch(title_url, data={'name': 'Новое название'})
+        assert response.status_code == 200
+        assert reader.get(title_url).json()['name'] == 'Новое название', (
+            'Проверьте, что сразу после изменения ресурса он читается из '
+            'основной БД, чтобы кэш каталога не закрепил устаревший ответ'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_pin_in_other_worker(self, admin_client, admin, replicas, settings, tmp_path):
+        settings.DB_REPLICA_PIN_SECONDS = 5
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        replicas()
+        mark_replicas(reviews[0]['id'])
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+
+        def other_worker(location):
+            # Новый экземпляр кэша: как в другом процессе.
+            settings.CACHES = {
+                **settings.CACHES,
+                'default': {'BACKEND': backend, 'LOCATION': location},
+            }
+
+        backend = 'django.core.cache.backends.locmem.LocMemCache'
+        writer = auth_client(admin)
+        assert writer.patch('/api/v1/users/me/', data={'bio': 'bio'}).status_code == 200
+        other_worker('other-worker')
+        assert writer.get(url).json()['text'] == 'qwerty', (
+            'Проверьте, что закрепление за основной БД хранится в cookie и '
+            'действует в другом воркере с собственным кэшем'
+        )
+        writer.cookies.clear()
+        assert writer.get(url).json()['text'] in REPLICAS
+
+        backend = 'django.core.cache.backends.filebased.FileBasedCache'
+        other_worker(str(tmp_path / 'cache'))
+        writer = auth_client(admin)
+        assert writer.patch('/api/v1/users/me/', data={'bio': 'bio'}).status_code == 200
+        writer.cookies.clear()
+        other_worker(str(tmp_path / 'cache'))
+        assert writer.get(url).json()['text'] == 'qwerty', (
+            'Проверьте, что клиент без cookie закреплён через общий кэш'
+        )
+        assert auth_client(user).get(url).json()['text'] in REPLICAS
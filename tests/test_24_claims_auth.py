@@ -0,0 +1,168 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.backends import TokenBackend
+
+from tests.common import create_titles
+
+
+def claims_client(user):
+    from users.authentication import access_token_for
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}')
+    return client
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Общий для процессов кэш ``default``: каждый вызов — новый экземпляр
+    над тем же каталогом, как в другом воркере.
+    """
+    def worker():
+        settings.CACHES = {
+            **settings.CACHES,
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path / 'cache'),
+            },
+        }
+
+    worker()
+    return worker
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if '"users_user"' in query['sql']
+    ]
+
+
+class Test24ClaimsAuth:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_from_claims(self, admin_client, admin, shared_cache):
+        titles, _, _ = create_titles(admin_client)
+        client = claims_client(admin)
+        # Первый запрос кэширует версию токенов пользователя.
+        assert client.get('/api/v1/categories/').status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+            assert response.status_code == 201
+            assert user_queries(context) == [], (
+                'Проверьте, что права администратора проверяются по claims токена без запроса к пользователям'
+            )
+        response = client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201 and response.json()['author'] == admin.username, (
+            'Проверьте, что пользователя из claims можно сохранить автором отзыва'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/users/me/')
+            assert response.json()['bio'] == 'admin bio', (
+                'Проверьте, что остальные поля пользователя догружаются при обращении'
+            )
+            assert len(user_queries(context)) == 1, (
+                'Проверьте, что отложенные поля пользователя догружаются одним запросом'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_change_revokes_tokens(self, user_superuser_client, admin, user):
+        admin_claims, user_claims = claims_client(admin), claims_client(user)
+        response = user_claims.patch('/api/v1/users/me/', data={'bio': 'new bio'})
+        assert response.status_code == 200
+        assert user_claims.get('/api/v1/users/me/').status_code == 200, (
+            'Проверьте, что изменение полей не из claims не отзывает токен'
+        )
+
+        response = user_superuser_client.patch(f'/api/v1/users/{admin.username}/', data={'role': 'user'})
+        assert response.status_code == 200
+        response = admin_claims.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        assert response.status_code == 401, (
+            'Проверьте, что после смены роли через /users/{username}/ старый токен не принимается'
+        )
+        admin.refresh_from_db()
+        response = claims_client(admin).post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        assert response.status_code == 403, (
+            'Проверьте, что новый токен содержит новую роль'
+        )
+
+        response = user_superuser_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert user_claims.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что токены удалённого пользователя не принимаются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_verified_tokens_lru(self, monkeypatch, settings, admin, user):
+        settings.JWT_VERIFIED_TOKENS = 1
+        decoded = []
+        decode = TokenBackend.decode
+
+        def counting_decode(backend, token, verify=True):
+            decoded.append(token)
+            return decode(backend, token, verify)
+
+        monkeypatch.setattr(TokenBackend, 'decode', counting_decode)
+        admin_claims, user_claims = claims_client(admin), claims_client(user)
+        for _ in range(3):
+            assert admin_claims.get('/api/v1/users/me/').status_code == 200
+        assert len(decoded) == 1, (
+            'Проверьте, что подпись уже проверенного токена не проверяется повторно'
+        )
+        user_claims.get('/api/v1/users/me/')
+        admin_claims.get('/api/v1/users/me/')
+        assert len(decoded) == 3, (
+            'Проверьте, что размер кэша проверенных токенов ограничен JWT_VERIFIED_TOKENS'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_revocation_across_workers(
+        self, user_superuser_client, admin, settings, shared_cache, monkeypatch,
+    ):
+        from django.core.cache import caches
+        from users.authentication import token_version_key
+
+        admin_claims = claims_client(admin)
+        assert admin_claims.get('/api/v1/users/me/').status_code == 200
+        shared_cache()
+        response = user_superuser_client.patch(f'/api/v1/users/{admin.username}/', data={'role': 'user'})
+        assert response.status_code == 200
+        shared_cache()
+        assert admin_claims.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что с общим кэшем отзыв токена виден другому воркеру'
+        )
+
+        settings.CACHES = {
+            **settings.CACHES,
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        }
+        admin.refresh_from_db()
+        admin_claims = claims_client(admin)
+        response = user_superuser_client.patch(f'/api/v1/users/{admin.username}/', data={'role': 'admin'})
+        assert response.status_code == 200
+        # Другой воркер не видел сброса и хранит прежнюю версию.
+        caches['default'].set(
+            token_version_key(admin.pk), admin.token_version, settings.JWT_TOKEN_VERSION_LOCAL_TIMEOUT
+        )
+        assert admin_claims.get('/api/v1/users/me/').status_code == 200
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + settings.JWT_TOKEN_VERSION_LOCAL_TIMEOUT + 1)
+        assert admin_claims.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что с locmem отозванный токен принимается не дольше '
+            'JWT_TOKEN_VERSION_LOCAL_TIMEOUT секунд'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_no_user_queries_with_locmem(self, admin):
+        client = claims_client(admin)
+        assert client.get('/api/v1/categories/').status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            assert client.get('/api/v1/categories/').status_code == 200
+            assert user_queries(context) == [], (
+                'Проверьте, что с кэшем по умолчанию аутентифицированный GET '
+                'не обращается к таблице пользователей'
+            )
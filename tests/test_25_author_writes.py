@@ -0,0 +1,120 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.common import auth_client, create_comments
+
+
+def selects(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT') and '"users_user"' not in query['sql']
+    ]
+
+
+def object_selects(context):
+    # Загрузка пользователя из токена без claims не считается.
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT') and 'FROM "users_user"' not in query['sql']
+    ]
+
+
+class Test25AuthorWrites:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_author_updates_with_one_select(self, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        client = auth_client(user)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        comment_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/{comments[1]["id"]}/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.patch(review_url, data={'score': 9})
+            queries = selects(context)
+            updates = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('UPDATE "reviews_review"')
+            ]
+        assert response.status_code == 200 and response.json()['author'] == user.username
+        assert len(queries) == 1 and '"author_id" = ' in queries[0], (
+            'Проверьте, что отзыв для изменения ищется одним запросом с фильтром по автору'
+        )
+        assert updates and '"text"' not in updates[0], (
+            'Проверьте, что при изменении отзыва сохраняются только переданные поля'
+        )
+        assert Review.objects.get(pk=reviews[1]['id']).score == 9
+
+        response = client.put(review_url, data={'text': 'Новый текст', 'score': 8})
+        assert response.status_code == 200 and response.json()['text'] == 'Новый текст'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.patch(comment_url, data={'text': 'Новый текст'})
+            assert len(selects(context)) == 1, (
+                'Проверьте, что комментарий для изменения ищется одним запросом'
+            )
+        assert response.status_code == 200 and response.json()['text'] == 'Новый текст'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.delete(comment_url)
+            assert len(selects(context)) == 1
+        assert response.status_code == 204
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_foreign_and_missing_objects(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        client = auth_client(user)
+        title_id = titles[0]['id']
+        response = client.patch(f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/', data={'text': 'x'})
+        assert response.status_code == 403, (
+            'Проверьте, что чужой отзыв нельзя изменить'
+        )
+        response = client.delete(f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[1]["id"]}/')
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв ищется только среди отзывов произведения из URL'
+        )
+        response = client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/comments/{comments[1]["id"]}/',
+            data={'text': 'x'},
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что комментарий ищется только среди комментариев отзыва из URL'
+        )
+        response = auth_client(moderator).patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/', data={'text': 'Модерация'}
+        )
+        assert response.status_code == 200 and response.json()['author'] == user.username, (
+            'Проверьте, что модератор может изменить чужой отзыв'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_moderator_updates_with_one_select(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        client = auth_client(moderator)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        urls = (
+            (f'{title_url}reviews/{reviews[1]["id"]}/', user),
+            (f'{title_url}reviews/{reviews[0]["id"]}/comments/{comments[1]["id"]}/', user),
+        )
+        for url, author in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = client.patch(url, data={'text': 'Модерация'})
+                queries = object_selects(context)
+            assert response.status_code == 200 and response.json()['author'] == author.username
+            assert len(queries) == 1 and 'JOIN "users_user"' in queries[0], (
+                'Проверьте, что модератор загружает объект вместе с автором одним запросом'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_search_does_not_hide_foreign_object(self, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        response = auth_client(user).patch(f'{url}?search=qwerty', data={'text': 'x'})
+        assert response.status_code == 403, (
+            'Проверьте, что не автор получает 403, а не 404, и с параметрами фильтрации'
+        )
+        response = auth_client(user).patch(f'{url}?search=missing', data={'text': 'x'})
+        assert response.status_code == 404, (
+            'Проверьте, что существование объекта для ответа 403 проверяется с теми же фильтрами'
+        )
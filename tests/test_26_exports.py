@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.common import create_comments
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+class Test26Exports:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ndjson(self, client, user_client, admin_client, admin, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        assert client.get('/api/v1/export/reviews.ndjson').status_code == 401
+        assert user_client.get('/api/v1/export/reviews.ndjson').status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+        assert admin_client.get('/api/v1/export/users.ndjson').status_code == 404
+        assert admin_client.get('/api/v1/export/reviews.xml').status_code == 404
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get('/api/v1/export/reviews.ndjson')
+            assert response.status_code == 200 and response.streaming, (
+                'Проверьте, что выгрузка отдаётся потоком'
+            )
+            assert response['Content-Type'] == 'application/x-ndjson'
+            rows = [json.loads(line) for line in content(response).splitlines()]
+            assert not any('COUNT(' in query['sql'] for query in context.captured_queries)
+        assert [row['id'] for row in rows] == sorted(review['id'] for review in reviews)
+        assert {row['author'] for row in rows} == {review['author'] for review in reviews}, (
+            'Проверьте, что в выгрузке отзывов есть username автора'
+        )
+        assert set(rows[0]) == {'id', 'title_id', 'author', 'text', 'score', 'pub_date'}
+
+        response = admin_client.get(f'/api/v1/export/comments.ndjson?review_id={reviews[0]["id"]}')
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert len(rows) == len(comments) and rows[0]['title_id'] == titles[0]['id']
+        response = admin_client.get(f'/api/v1/export/comments.ndjson?review_id={reviews[1]["id"]}')
+        assert content(response) == '', (
+            'Проверьте, что выгрузку комментариев можно отфильтровать по review_id'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_csv(self, admin_client, admin, settings):
+        settings.EXPORT_CHUNK_SIZE = 1
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = admin_client.get('/api/v1/export/titles.csv')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/csv')
+        assert response['Content-Disposition'] == 'attachment; filename="titles.csv"'
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert [row['name'] for row in rows] == [title['name'] for title in titles]
+        assert rows[0]['genres'] == ','.join(sorted(titles[0]['genre'])), (
+            'Проверьте, что в выгрузке произведений есть слаги жанров'
+        )
+        assert rows[0]['category'] == titles[0]['category']
+        assert rows[0]['rating_count'] == str(len(reviews))
+
+        response = admin_client.get('/api/v1/export/reviews.csv?title_id=0')
+        assert content(response).splitlines() == ['id,title_id,author,text,score,pub_date'], (
+            'Проверьте, что пустая CSV-выгрузка содержит только заголовок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalid_filters(self, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        for url, param in (
+            ('/api/v1/export/titles.csv?year=abc', 'year'),
+            ('/api/v1/export/reviews.ndjson?title_id=x', 'title_id'),
+            ('/api/v1/export/comments.ndjson?title_id=1&review_id=1.5', 'review_id'),
+        ):
+            response = admin_client.get(url)
+            assert response.status_code == 400 and param in response.json(), (
+                'Проверьте, что некорректный фильтр выгрузки возвращает статус 400'
+            )
+        response = admin_client.get(f'/api/v1/export/comments.ndjson?title_id={titles[0]["id"]}')
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert rows and all(row['title_id'] == titles[0]['id'] for row in rows), (
+            'Проверьте, что фильтр через связь продолжает работать'
+        )
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.common import create_reviews
+
+
+class Test27Renderers:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_json_matches_stdlib(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        for url in ('/api/v1/titles/?stats=true', f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            response = client.get(url)
+            assert response['Content-Type'] == 'application/json'
+            assert response.content == JSONRenderer().render(response.data), (
+                'Проверьте, что быстрый JSON-рендерер отдаёт те же байты, что JSONRenderer'
+            )
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='application/json; indent=2')
+        assert b'\n  ' in response.content, (
+            'Проверьте, что отступы из Accept по-прежнему поддерживаются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_msgpack(self, client, admin_client, admin):
+        msgpack = pytest.importorskip('msgpack')
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, HTTP_ACCEPT='application/msgpack')
+        assert response['Content-Type'] == 'application/msgpack', (
+            'Проверьте, что MessagePack выбирается по заголовку Accept'
+        )
+        assert msgpack.unpackb(response.content) == json.loads(client.get(url).content)
+        response = client.get(url, {'format': 'msgpack'})
+        assert response['Content-Type'] == 'application/msgpack'
+
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data=msgpack.packb({'text': 'Отзыв в MessagePack', 'score': 8}),
+            content_type='application/msgpack',
+        )
+        assert response.status_code == 201 and response.json()['score'] == 8, (
+            'Проверьте, что тело запроса в MessagePack разбирается'
+        )
+        for body in (b'\xc1', b'\x01\x02'):
+            response = admin_client.post(
+                f'/api/v1/titles/{titles[1]["id"]}/reviews/', data=body, content_type='application/msgpack'
+            )
+            detail = response.json()['detail']
+            assert response.status_code == 400 and detail.startswith('MessagePack parse error - '), (
+                'Проверьте, что некорректный MessagePack возвращает статус 400'
+            )
+            assert detail.split(' - ', 1)[1].strip(), (
+                'Проверьте, что ошибка разбора MessagePack содержит описание'
+            )
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/', data=b'{"text": ', content_type='application/json'
+        )
+        assert response.status_code == 400 and 'JSON parse error' in response.json()['detail']
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.common import create_comments, create_reviews
+
+
+class Test28SparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/', {'fields': 'id,name,rating'})
+            sql = [query['sql'] for query in context.captured_queries]
+        assert response.status_code == 200
+        assert set(response.json()['results'][0]) == {'id', 'name', 'rating'}, (
+            'Проверьте, что `?fields=` оставляет только перечисленные поля'
+        )
+        assert not any('genre' in query for query in sql), (
+            'Проверьте, что жанры не загружаются, если их нет в `?fields=`'
+        )
+        assert not any('"description"' in query or 'category' in query for query in sql), (
+            'Проверьте, что ненужные столбцы и связи не попадают в запрос'
+        )
+
+        response = client.get('/api/v1/titles/', {'exclude': 'description,genre'})
+        title = response.json()['results'][0]
+        assert 'genre' not in title and 'description' not in title and 'category' in title, (
+            'Проверьте, что `?exclude=` убирает перечисленные поля'
+        )
+        response = client.get('/api/v1/titles/', {'fields': 'name,stats', 'stats': 'true'})
+        assert set(response.json()['results'][0]) == {'name', 'stats'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_field(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            response = client.get(url, {'fields': 'id,password'})
+            assert response.status_code == 400, (
+                'Проверьте, что неизвестное поле в `?fields=` возвращает статус 400'
+            )
+        response = client.get('/api/v1/titles/', {'fields': 'stats'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_and_comments(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'id,score'})
+            sql = [query['sql'] for query in context.captured_queries]
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert results and set(results[0]) == {'id', 'score'}
+        assert not any('users_user' in query or '"text"' in query for query in sql), (
+            'Проверьте, что автор и текст отзыва не загружаются без `?fields=author,text`'
+        )
+        response = client.get(url, {'fields': 'id', 'page_size': 1})
+        assert response.status_code == 200 and response.json()['results']
+
+        review_id = results[0]['id']
+        response = client.get(f'{url}{review_id}/comments/', {'exclude': 'text'})
+        assert response.status_code == 200
+        for comment in response.json()['results']:
+            assert 'text' not in comment and {'id', 'author', 'pub_date'} <= set(comment)
+        response = client.get(f'{url}{review_id}/', {'fields': 'text'})
+        assert response.status_code == 200 and set(response.json()) == {'text'}
+
+        response = admin_client.patch(f'{url}{review_id}/?fields=id', data={'score': 3})
+        assert response.status_code == 200 and response.json()['score'] == 3, (
+            'Проверьте, что `?fields=` не влияет на изменяющие запросы'
+        )
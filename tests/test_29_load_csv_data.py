@@ -0,0 +1,78 @@
+import csv
+import io
+import os
+from collections import defaultdict
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from categories.models import Category, Title, TitleGenre
+from reviews.models import Comment, Review
+from users.models import User
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+
+def read_rows(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8', newline='') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+class Test29LoadCsvData:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_static_data(self, client, admin_client):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        call_command('load_csv_data', stdout=io.StringIO())
+        assert client.get('/api/v1/titles/').json()['count'] == len(read_rows('titles.csv')), (
+            'Проверьте, что после загрузки кэш каталога сбрасывается'
+        )
+        for filename, model in (
+            ('category.csv', Category), ('titles.csv', Title), ('genre_title.csv', TitleGenre),
+            ('review.csv', Review), ('comments.csv', Comment),
+        ):
+            assert model.objects.count() == len(read_rows(filename)), (
+                f'Проверьте, что `load_csv_data` загружает все строки `{filename}`'
+            )
+        usernames = [row['username'] for row in read_rows('users.csv')]
+        assert User.objects.filter(username__in=usernames).count() == len(usernames)
+
+        scores = defaultdict(list)
+        for row in read_rows('review.csv'):
+            scores[int(row['title_id'])].append(int(row['score']))
+        for title_id, title_scores in scores.items():
+            assert Title.objects.get(pk=title_id).rating == pytest.approx(
+                sum(title_scores) / len(title_scores)
+            ), (
+                'Проверьте, что после загрузки пересчитываются рейтинги произведений'
+            )
+
+        title = read_rows('titles.csv')[0]
+        response = client.get('/api/v1/titles/', {'search': title['name'].split()[0]})
+        assert int(title['id']) in [result['id'] for result in response.json()['results']], (
+            'Проверьте, что загруженные произведения находятся поиском'
+        )
+        review = Review.objects.get(pk=read_rows('review.csv')[0]['id'])
+        response = client.get(
+            f'/api/v1/titles/{review.title_id}/reviews/', {'search': review.text.split()[1]}
+        )
+        assert review.pk in [result['id'] for result in response.json()['results']]
+
+        response = admin_client.post('/api/v1/categories/', data={'name': 'Новая', 'slug': 'new'})
+        assert response.status_code == 201, (
+            'Проверьте, что после загрузки с явными id новые записи создаются без конфликтов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_skipped_rows_are_not_referenced(self):
+        category = read_rows('category.csv')[0]
+        Category.objects.create(id=1000, name='Занято', slug=category['slug'])
+        call_command('load_csv_data', stdout=io.StringIO())
+        assert not Category.objects.filter(pk=category['id']).exists()
+        titles = [row['id'] for row in read_rows('titles.csv') if row['category'] == category['id']]
+        assert titles and not Title.objects.filter(
+            pk__in=titles, category__isnull=False
+        ).exists(), (
+            'Проверьте, что строки, пропущенные из-за конфликта, не считаются загруженными'
+        )
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+def parent_lookups(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+    ]
+
+
+class Test30NestedParents:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_wrong_parent_is_404(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        other_title = titles[1]['id']
+        response = client.get(f'/api/v1/titles/{other_title}/reviews/{reviews[0]["id"]}/comments/')
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии отзыва, запрошенные с чужим `title_id`, возвращают 404'
+        )
+        response = client.get(f'/api/v1/titles/{other_title}/reviews/{reviews[0]["id"]}/comments/'
+                              f'{comments[0]["id"]}/')
+        assert response.status_code == 404
+        response = admin_client.post(
+            f'/api/v1/titles/{other_title}/reviews/{reviews[0]["id"]}/comments/', data={'text': 'Мимо'}
+        )
+        assert response.status_code == 404
+
+        response = client.get(f'/api/v1/titles/{other_title}/reviews/')
+        assert response.status_code == 200 and response.json()['results'] == [], (
+            'Проверьте, что у существующего произведения без отзывов возвращается пустой список'
+        )
+        assert client.get('/api/v1/titles/999999/reviews/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_page_past_the_end_is_404(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.get(url, {'page': 99}).status_code == 404, (
+            'Проверьте, что запрос страницы после последней возвращает 404'
+        )
+        assert client.get(f'{url}{reviews[0]["id"]}/comments/', {'page': 99}).status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_single_parent_lookup(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        writer = auth_client(moderator)
+        writer.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = writer.post(f'{url}{reviews[0]["id"]}/comments/', data={'text': 'Ещё один'})
+            lookups = parent_lookups(context, 'reviews_review')
+        assert response.status_code == 201
+        assert len(lookups) == 1, (
+            'Проверьте, что отзыв при создании комментария загружается одним запросом'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = writer.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 7})
+            lookups = parent_lookups(context, 'categories_title')
+        assert response.status_code == 201
+        assert len(lookups) == 1, (
+            'Проверьте, что произведение при создании отзыва загружается одним запросом'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}{reviews[0]["id"]}/comments/')
+            lookups = parent_lookups(context, 'reviews_review')
+        assert response.status_code == 200 and not lookups, (
+            'Проверьте, что непустой список комментариев не загружает отзыв отдельным запросом'
+        )